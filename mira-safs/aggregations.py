@@ -0,0 +1,82 @@
+import functools
+import pandas as pd
+from pathlib import Path
+
+import datastore
+import geojson_stream
+import training
+from training import SOIL_FEATURES
+
+# Dashboard aggregations shared by the Streamlit pages and the JSON API.
+# Nothing here imports Streamlit; failures raise instead of being rendered.
+
+# Source files the crop models are trained from
+TRAINING_SOURCES = [datastore.ASSETS_PATH / name for name in ('soil_data.csv', 'crops_data.csv', 'fertilizers_data.csv')]
+
+def emissions_by(data, column):
+    """Sum Emissions_Amount per value of the given column."""
+    return data.groupby(column)['Emissions_Amount'].sum().reset_index()
+
+def animal_counts(livestock_data):
+    """Count the livestock of each animal type."""
+    counts = livestock_data['animal'].value_counts().reset_index()
+    counts.columns = ['Animal', 'Count']
+    return counts
+
+def vaccine_counts(health_check_data):
+    """Count the number of times each vaccine was administered."""
+    vaccines_count = health_check_data['vaccines'].value_counts().reset_index()
+    vaccines_count.columns = ['Vaccine', 'Count']
+    return vaccines_count
+
+def disease_counts(health_check_data):
+    """Count the occurrences of each disease across health checks."""
+    diseases_series = health_check_data['diseases'].str.split(',', expand=True).stack()
+    diseases_count = diseases_series.value_counts().reset_index()
+    diseases_count.columns = ['Disease', 'Count']
+    return diseases_count
+
+@functools.lru_cache(maxsize=1)
+def load_models(version):
+    """Train the crop models out of core once per source version."""
+    return training.train_models(datastore.ASSETS_PATH)
+
+def merge_data(crops_data, soil_data, fertilizers_data, id_column='id'):
+    """Join soil conditions with production and fertilizer quantity per field."""
+    data = pd.merge(soil_data, crops_data[[id_column, 'production']], on=id_column)
+    return pd.merge(data, fertilizers_data[[id_column, 'quantity']], on=id_column)
+
+def productivity_comparison(data, model, id_column='id'):
+    """Compare current production with the model's predicted productivity."""
+    return pd.DataFrame({
+        'Field ID': data[id_column],
+        'Current Production': data['production'].values,
+        'Predicted Productivity': model.predict(data[SOIL_FEATURES].values)
+    })
+
+def fertilizer_comparison(data, model, id_column='id'):
+    """Compare applied fertilizer quantity with the model's predicted quantity."""
+    return pd.DataFrame({
+        'Field ID': data[id_column],
+        'Actual Quantity': data['quantity'],
+        'Predicted Quantity': model.predict(data[SOIL_FEATURES].values)
+    })
+
+def load_areas(geojson_path):
+    """Load field names and areas through the shared store, without geometries."""
+    return datastore.get_frame(Path(geojson_path).stem + '_areas', [geojson_path],
+                               lambda: geojson_stream.area_table(geojson_path))
+
+def area_statistics(geojson_path):
+    """Return summary statistics and the per-field areas of a GeoJSON file.
+
+    Areas are computed while streaming the GeoJSON in batches; features
+    without a 'name' property are named by their position. Errors reading
+    the file propagate to the caller.
+    """
+    areas = load_areas(geojson_path)
+    stats = {
+        'Total Area (hectares)': areas['area_ha'].sum(),
+        'Number of Features': len(areas)
+    }
+    return stats, areas
@@ -0,0 +1,167 @@
+import argparse
+import hashlib
+import json
+import threading
+import pandas as pd
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import datastore
+import aggregations
+import soil_rules
+
+def _asset(name):
+    return datastore.ASSETS_PATH / name
+
+def _records(frame):
+    """Serialize a DataFrame as a list of JSON records."""
+    return json.loads(frame.to_json(orient='records', date_format='iso'))
+
+def _emissions(column):
+    def compute():
+        data = datastore.load_csv('emissions_data.csv')
+        return _records(aggregations.emissions_by(data, column))
+    return compute
+
+def _livestock_by_animal():
+    return _records(aggregations.animal_counts(datastore.load_csv('livestock_data.csv')))
+
+def _vaccines():
+    return _records(aggregations.vaccine_counts(datastore.load_csv('health_check_data.csv')))
+
+def _diseases():
+    return _records(aggregations.disease_counts(datastore.load_csv('health_check_data.csv')))
+
+def _crop_predictions(kind):
+    def compute():
+        data = aggregations.merge_data(datastore.load_csv('crops_data.csv'), datastore.load_csv('soil_data.csv'),
+                                       datastore.load_csv('fertilizers_data.csv'))
+        productivity_model, fertilizer_model = aggregations.load_models(
+            datastore.source_version(aggregations.TRAINING_SOURCES))
+        if kind == 'productivity':
+            return _records(aggregations.productivity_comparison(data, productivity_model))
+        return _records(aggregations.fertilizer_comparison(data, fertilizer_model))
+    return compute
+
+def _soil_recommendations():
+    soil_data = datastore.load_csv('soil_data.csv')
+    return _records(pd.DataFrame({
+        'Field ID': soil_data['id'],
+        'Recommendation': soil_rules.recommend(soil_data)
+    }))
+
+def _area_statistics():
+    stats, areas = aggregations.area_statistics(_asset('field.geojson'))
+    return {'statistics': stats, 'areas': _records(areas)}
+
+# Path -> (source files the response depends on, function computing the JSON payload)
+ENDPOINTS = {
+    '/emissions/by-practice': ([_asset('emissions_data.csv')], _emissions('Farming_Practice')),
+    '/emissions/by-type': ([_asset('emissions_data.csv')], _emissions('Emissions_Type')),
+    '/emissions/over-time': ([_asset('emissions_data.csv')], _emissions('Date')),
+    '/emissions/by-energy-source': ([_asset('emissions_data.csv')], _emissions('Energy_Source')),
+    '/livestock/by-animal': ([_asset('livestock_data.csv')], _livestock_by_animal),
+    '/livestock/vaccines': ([_asset('health_check_data.csv')], _vaccines),
+    '/livestock/diseases': ([_asset('health_check_data.csv')], _diseases),
+    '/crops/productivity-predictions': (aggregations.TRAINING_SOURCES, _crop_predictions('productivity')),
+    '/crops/fertilizer-predictions': (aggregations.TRAINING_SOURCES, _crop_predictions('fertilizer')),
+    '/crops/soil-recommendations': ([_asset('soil_data.csv')], _soil_recommendations),
+    '/maps/area-statistics': ([_asset('field.geojson')], _area_statistics),
+}
+
+class ResponseCache:
+    """Encoded responses keyed by path and the version of their sources.
+
+    A response is computed once per source version; concurrent requests for
+    the same stale path wait on one computation instead of repeating it.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._locks = {path: threading.Lock() for path in ENDPOINTS}
+
+    def get(self, path):
+        sources, compute = ENDPOINTS[path]
+        version = datastore.source_version(sources)
+        entry = self._entries.get(path)
+        if entry is None or entry['version'] != version:
+            with self._locks[path]:
+                entry = self._entries.get(path)
+                if entry is None or entry['version'] != version:
+                    body = json.dumps(compute(), default=float).encode('utf-8')
+                    entry = {
+                        'version': version,
+                        'body': body,
+                        'etag': '"' + hashlib.sha1(body).hexdigest() + '"',
+                        # HTTP dates have one-second resolution
+                        'last_modified': int(max(source.stat().st_mtime for source in sources)),
+                    }
+                    self._entries[path] = entry
+        return entry
+
+class ApiHandler(BaseHTTPRequestHandler):
+    cache = ResponseCache()
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip('/') or '/'
+        if path == '/':
+            return self._send_json(200, {'endpoints': sorted(ENDPOINTS)})
+        if path not in ENDPOINTS:
+            return self._send_json(404, {'error': f"Unknown endpoint: {path}"})
+        try:
+            entry = self.cache.get(path)
+        except Exception as e:
+            return self._send_json(500, {'error': str(e)})
+
+        headers = {
+            'ETag': entry['etag'],
+            'Last-Modified': formatdate(entry['last_modified'], usegmt=True),
+            'Cache-Control': 'no-cache',
+        }
+        if self._not_modified(entry):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self._send_json(200, entry['body'], headers)
+
+    def _not_modified(self, entry):
+        """Evaluate conditional request headers; If-None-Match takes precedence."""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or entry['etag'] in tags or f"W/{entry['etag']}" in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since is not None:
+            try:
+                return entry['last_modified'] <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_json(self, status, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def main():
+    """Serve the dashboard aggregations as JSON."""
+    parser = argparse.ArgumentParser(description="Mira headless JSON API.")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    server.daemon_threads = True
+    print(f"Serving Mira API on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,27 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-from pathlib import Path
+import export
+import datastore
+import geojoin
+import schemas
+from aggregations import emissions_by
 
 # Load the climate data
 def load_data():
-    # Define the path to the 'assets' directory
-    assets_path = Path(__file__).parent / 'assets'
-    
-    # Load the CSV file from the 'assets' directory
-    return pd.read_csv(assets_path / 'emissions_data.csv')
+    # Load the CSV file from the 'assets' directory through the shared store
+    return datastore.load_csv('emissions_data.csv')
 
 def app():
-    # Load data
-    data = load_data()
+    # Load data; the frame arrives validated and typed from the shared store
+    try:
+        data = load_data()
+    except schemas.SchemaError as e:
+        st.error(f"Error loading data: {e}")
+        return
+    message = schemas.issues_message(data)
+    if message:
+        st.warning(message)
+    exports = {'Emissions Records': data}
 
     # Create the Streamlit layout
     st.title("Climate Data Analysis")
@@ -27,65 +35,69 @@ def app():
         st.write("""
         This graph shows the total emissions by different farming practices.
         """)
-        # Check if the column exists before proceeding
-        if 'Farming_Practice' in data.columns and 'Emissions_Amount' in data.columns:
-            # Group by Farming_Practice and sum Emissions_Amount
-            emissions_by_practice = data.groupby('Farming_Practice')['Emissions_Amount'].sum().reset_index()
-            fig1 = px.bar(emissions_by_practice, x='Farming_Practice', y='Emissions_Amount',
-                          title="Total Emissions by Farming Practice",
-                          labels={'Farming_Practice': 'Farming Practice', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
-            st.plotly_chart(fig1)
-        else:
-            st.error("Columns 'Farming_Practice' or 'Emissions_Amount' not found in data.")
+        # Group by Farming_Practice and sum Emissions_Amount
+        emissions_by_practice = emissions_by(data, 'Farming_Practice')
+        exports['Emissions by Farming Practice'] = emissions_by_practice
+        fig1 = px.bar(emissions_by_practice, x='Farming_Practice', y='Emissions_Amount',
+                      title="Total Emissions by Farming Practice",
+                      labels={'Farming_Practice': 'Farming Practice', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
+        st.plotly_chart(fig1)
 
     with col2:
         st.header("Emissions by Type")
         st.write("""
         This graph shows the distribution of emissions by type (e.g., N2O, CH4).
         """)
-        # Check if the column exists before proceeding
-        if 'Emissions_Type' in data.columns and 'Emissions_Amount' in data.columns:
-            # Group by Emissions_Type and sum Emissions_Amount
-            emissions_by_type = data.groupby('Emissions_Type')['Emissions_Amount'].sum().reset_index()
-            fig2 = px.pie(emissions_by_type, names='Emissions_Type', values='Emissions_Amount',
-                          title="Distribution of Emissions by Type",
-                          labels={'Emissions_Type': 'Emissions Type', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
-            st.plotly_chart(fig2)
-        else:
-            st.error("Columns 'Emissions_Type' or 'Emissions_Amount' not found in data.")
+        # Group by Emissions_Type and sum Emissions_Amount
+        emissions_by_type = emissions_by(data, 'Emissions_Type')
+        exports['Emissions by Type'] = emissions_by_type
+        fig2 = px.pie(emissions_by_type, names='Emissions_Type', values='Emissions_Amount',
+                      title="Distribution of Emissions by Type",
+                      labels={'Emissions_Type': 'Emissions Type', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
+        st.plotly_chart(fig2)
 
     with row1:
         st.header("Emissions Over Time")
         st.write("""
         This graph shows how emissions change over time.
         """)
-        # Convert Date column to datetime
-        if 'Date' in data.columns and 'Emissions_Amount' in data.columns:
-            data['Date'] = pd.to_datetime(data['Date'])
-            # Group by Date and sum Emissions_Amount
-            emissions_over_time = data.groupby('Date')['Emissions_Amount'].sum().reset_index()
-            fig3 = px.line(emissions_over_time, x='Date', y='Emissions_Amount',
-                           title="Emissions Over Time",
-                           labels={'Date': 'Date', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
-            st.plotly_chart(fig3)
-        else:
-            st.error("Columns 'Date' or 'Emissions_Amount' not found in data.")
+        # Group by Date and sum Emissions_Amount
+        emissions_over_time = emissions_by(data, 'Date')
+        exports['Emissions Over Time'] = emissions_over_time
+        fig3 = px.line(emissions_over_time, x='Date', y='Emissions_Amount',
+                       title="Emissions Over Time",
+                       labels={'Date': 'Date', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
+        st.plotly_chart(fig3)
 
     with row2:
         st.header("Emissions by Energy Source")
         st.write("""
         This graph shows the total emissions by different energy sources.
         """)
-        # Check if the column exists before proceeding
-        if 'Energy_Source' in data.columns and 'Emissions_Amount' in data.columns:
-            # Group by Energy_Source and sum Emissions_Amount
-            emissions_by_energy_source = data.groupby('Energy_Source')['Emissions_Amount'].sum().reset_index()
-            fig4 = px.bar(emissions_by_energy_source, x='Energy_Source', y='Emissions_Amount',
-                          title="Total Emissions by Energy Source",
-                          labels={'Energy_Source': 'Energy Source', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
-            st.plotly_chart(fig4)
-        else:
-            st.error("Columns 'Energy_Source' or 'Emissions_Amount' not found in data.")
+        # Group by Energy_Source and sum Emissions_Amount
+        emissions_by_energy_source = emissions_by(data, 'Energy_Source')
+        exports['Emissions by Energy Source'] = emissions_by_energy_source
+        fig4 = px.bar(emissions_by_energy_source, x='Energy_Source', y='Emissions_Amount',
+                      title="Total Emissions by Energy Source",
+                      labels={'Energy_Source': 'Energy Source', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
+        st.plotly_chart(fig4)
+
+    # Break emissions down per field when records carry coordinates
+    coordinates = geojoin.coordinate_columns(data)
+    if coordinates:
+        st.header("Emissions by Field")
+        st.write("""
+        This graph shows the total emissions of records assigned to their nearest field.
+        """)
+        located = geojoin.get_field_index().assign_frame(data, *coordinates)
+        emissions_by_field = emissions_by(located.dropna(subset=['field']), 'field')
+        exports['Emissions by Field'] = emissions_by_field
+        fig5 = px.bar(emissions_by_field, x='field', y='Emissions_Amount',
+                      title="Total Emissions by Field",
+                      labels={'field': 'Field', 'Emissions_Amount': 'Total Emissions (kg CO2e)'})
+        st.plotly_chart(fig5)
+
+    export.export_section(exports, key='emission')
 
 if __name__ == "__main__":
     app()
@@ -1,54 +1,53 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from sklearn.linear_model import LinearRegression
-from pathlib import Path
+import soil_rules
+import export
+import datastore
+import schemas
+from training import SOIL_FEATURES
+from aggregations import TRAINING_SOURCES, load_models, merge_data, productivity_comparison, fertilizer_comparison
 
 def load_data():
     """Load data from the 'assets' directory."""
-    assets_path = Path(__file__).parent / 'assets'
-    crops_data = pd.read_csv(assets_path / 'crops_data.csv')
-    soil_data = pd.read_csv(assets_path / 'soil_data.csv')
-    pest_pathogen_data = pd.read_csv(assets_path / 'pest_pathogen_data.csv')
-    fertilizers_data = pd.read_csv(assets_path / 'fertilizers_data.csv')
+    crops_data = datastore.load_csv('crops_data.csv')
+    soil_data = datastore.load_csv('soil_data.csv')
+    pest_pathogen_data = datastore.load_csv('pest_pathogen_data.csv')
+    fertilizers_data = datastore.load_csv('fertilizers_data.csv')
     return crops_data, soil_data, pest_pathogen_data, fertilizers_data
 
 def predict_productivity(soil_datarow, model):
     """Predict productivity based on soil conditions."""
-    features = soil_datarow[['soil_nitrogen', 'soil_phosphorus', 'soil_potassium', 
-                             'soil_moisture', 'soil_ph', 'organic_matter']].values.reshape(1, -1)
+    features = soil_datarow[SOIL_FEATURES].values.reshape(1, -1)
     predicted_productivity = model.predict(features)
     return predicted_productivity[0]
 
 def predict_fertilizer_quantity(soil_datarow, model):
     """Predict fertilizer quantity based on soil conditions."""
-    features = soil_datarow[['soil_nitrogen', 'soil_phosphorus', 'soil_potassium', 
-                             'soil_moisture', 'soil_ph', 'organic_matter']].values.reshape(1, -1)
+    features = soil_datarow[SOIL_FEATURES].values.reshape(1, -1)
     predicted_fertilizer_quantity = model.predict(features)
     return predicted_fertilizer_quantity[0]
 
 def app():
     """Main function to run the Streamlit app."""
-    # Load data
-    crops_data, soil_data, pest_pathogen_data, fertilizers_data = load_data()
+    # Load data; frames arrive validated and typed from the shared store
+    try:
+        crops_data, soil_data, pest_pathogen_data, fertilizers_data = load_data()
+    except schemas.SchemaError as e:
+        st.error(f"Error loading data: {e}")
+        return
+    for frame in (crops_data, soil_data, pest_pathogen_data, fertilizers_data):
+        message = schemas.issues_message(frame)
+        if message:
+            st.warning(message)
 
     id_column = 'id'
-    if id_column not in crops_data.columns or id_column not in soil_data.columns:
-        st.error(f"'{id_column}' column not found in the datasets. Please check the column names.")
-        return
 
     # Merge datasets
-    data = pd.merge(soil_data, crops_data[[id_column, 'production']], on=id_column)
-    data = pd.merge(data, fertilizers_data[[id_column, 'quantity']], on=id_column)
-
-    # Train models
-    X = data[['soil_nitrogen', 'soil_phosphorus', 'soil_potassium', 
-              'soil_moisture', 'soil_ph', 'organic_matter']].values
-    y_productivity = data['production'].values
-    y_fertilizer = data['quantity'].values
+    data = merge_data(crops_data, soil_data, fertilizers_data, id_column)
 
-    productivity_model = LinearRegression().fit(X, y_productivity)
-    fertilizer_model = LinearRegression().fit(X, y_fertilizer)
+    # Models are trained incrementally from chunked source data, not from this merge
+    productivity_model, fertilizer_model = load_models(datastore.source_version(TRAINING_SOURCES))
 
     # Create tabs
     tabs = st.tabs(["Crops Overview", "Soil Conditions", "Pest and Pathogen", "Fertilizers"])
@@ -70,7 +69,6 @@ def app():
 
         with col2:
             st.subheader("Production Over Time")
-            crops_data['production'] = pd.to_numeric(crops_data['production'], errors='coerce')
             fig = px.line(crops_data, x=id_column, y='production', title="Production Over Time")
             st.plotly_chart(fig)
 
@@ -81,16 +79,9 @@ def app():
 
         with row2:
             st.subheader("Productivity Prediction per Field")
-            current_production = data['production'].values
-            productivity_predictions = productivity_model.predict(X)
+            productivity_comparison_df = productivity_comparison(data, productivity_model, id_column)
 
-            comparison_df = pd.DataFrame({
-                'Field ID': data[id_column],
-                'Current Production': current_production,
-                'Predicted Productivity': productivity_predictions
-            })
-
-            fig = px.line(comparison_df, x='Field ID', y=['Current Production', 'Predicted Productivity'],
+            fig = px.line(productivity_comparison_df, x='Field ID', y=['Current Production', 'Predicted Productivity'],
                           title="Current vs Predicted Productivity per Field",
                           labels={'value': 'Production', 'variable': 'Type'},
                           markers=True)
@@ -129,6 +120,20 @@ def app():
             fig = px.bar(soil_data, x=id_column, y='organic_matter', title="Organic Matter by Field")
             st.plotly_chart(fig)
 
+        st.subheader("Soil Recommendation Rules")
+        st.write("""
+        Recommendations are generated from the threshold rules below. Each rule that a sample breaches
+        contributes its advice; samples that breach none are reported as optimal.
+        """)
+        st.table(soil_rules.rules_table())
+
+        st.subheader("Recommendations by Field")
+        recommendations = pd.DataFrame({
+            'Field ID': soil_data[id_column],
+            'Recommendation': soil_rules.recommend(soil_data)
+        })
+        st.dataframe(recommendations, hide_index=True, width='stretch')
+
     with tabs[2]:
         st.header("Pest and Pathogen Overview")
         st.write("""
@@ -184,19 +189,10 @@ def app():
 
         with row1:
             st.subheader("Fertilizer Quantity Comparison per Field")
-            # Predict fertilizer quantities
-            X_fertilizer = soil_data[['soil_nitrogen', 'soil_phosphorus', 'soil_potassium', 
-                                      'soil_moisture', 'soil_ph', 'organic_matter']].fillna(0)
-            predicted_fertilizer_quantities = fertilizer_model.predict(X_fertilizer)
-
-            # Combine actual and predicted data
-            comparison_df = pd.DataFrame({
-                'Field ID': data[id_column],
-                'Actual Quantity': data['quantity'],
-                'Predicted Quantity': predicted_fertilizer_quantities
-            })
-
-            fig = px.bar(comparison_df, x='Field ID', y=['Actual Quantity', 'Predicted Quantity'],
+            # Predict fertilizer quantities for the merged fields and combine with actual data
+            fertilizer_comparison_df = fertilizer_comparison(data, fertilizer_model, id_column)
+
+            fig = px.bar(fertilizer_comparison_df, x='Field ID', y=['Actual Quantity', 'Predicted Quantity'],
                          title="Actual vs Predicted Fertilizer Quantity per Field",
                          labels={'value': 'Quantity', 'variable': 'Type'},
                          barmode='group')
@@ -207,5 +203,16 @@ def app():
             fig = px.bar(fertilizers_data, x=id_column, y='quantity', title="Predicted Fertilizer Needs")
             st.plotly_chart(fig)
 
+    export.export_section({
+        'Crops': crops_data,
+        'Soil Conditions': soil_data,
+        'Soil Nutrients': nutrients,
+        'Soil Recommendations': recommendations,
+        'Pest and Pathogen': pest_pathogen_data,
+        'Fertilizers': fertilizers_data,
+        'Productivity Prediction': productivity_comparison_df,
+        'Fertilizer Prediction': fertilizer_comparison_df
+    }, key='crops')
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,206 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import schemas
+
+try:
+    import pyarrow as pa
+except ImportError:  # Binary columns are then rebuilt as bytes objects per process
+    pa = None
+
+# Asset directory; point MIRA_ASSETS_DIR elsewhere to serve another dataset (e.g. synthetic load-test data)
+ASSETS_PATH = Path(os.environ.get('MIRA_ASSETS_DIR', Path(__file__).parent / 'assets'))
+
+def _default_store_root():
+    """Prefer the node's RAM-backed /dev/shm so published data lives in shared memory."""
+    shm = Path('/dev/shm')
+    base = shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+    return base / 'mira-safs'
+
+STORE_ROOT = Path(os.environ.get('MIRA_STORE_DIR', _default_store_root()))
+
+# Number of superseded versions kept on disk for workers still attached to them
+KEEP_VERSIONS = 2
+
+# Bump whenever the on-disk layout or what published frames contain changes,
+# so stores published by an older release are rebuilt rather than reused
+STORE_FORMAT = 2
+
+_attached = {}
+_attached_lock = threading.Lock()
+
+def source_version(paths):
+    """Return a version string derived from the size and mtime of source files."""
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = Path(path).stat()
+        digest.update(f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+def dataset_version(sources, fingerprint=''):
+    """Return the store version of a dataset built from `sources`.
+
+    Besides the source files it covers STORE_FORMAT and a fingerprint of the
+    builder (e.g. a schema hash), so a changed build is republished.
+    """
+    digest = hashlib.sha1(f"{source_version(sources)}:{STORE_FORMAT}:{fingerprint}".encode())
+    return digest.hexdigest()[:16]
+
+def _dataset_dir(name):
+    return STORE_ROOT / name
+
+def current_version(name):
+    """Return the version currently published for a dataset, or None."""
+    try:
+        return (_dataset_dir(name) / 'CURRENT').read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+def publish(name, frame, version, attrs=None):
+    """Write a frame as immutable column files and atomically make it current.
+
+    Numeric, boolean and datetime columns are stored as .npy arrays, text
+    columns as integer codes with their distinct values in the manifest, and
+    bytes columns (e.g. WKB geometries) as a flat buffer plus offsets.
+    """
+    dataset_dir = _dataset_dir(name)
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    target = dataset_dir / version
+    if target.is_dir():
+        _set_current(dataset_dir, version)
+        return target
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=dataset_dir))
+    columns = []
+    for position, column in enumerate(frame.columns):
+        series = frame[column]
+        stem = f"c{position}"
+        if series.dtype.kind in 'biufcmM' and not isinstance(series.dtype, pd.DatetimeTZDtype):
+            np.save(staging / f"{stem}.npy", series.to_numpy())
+            columns.append({'name': column, 'kind': 'array', 'file': f"{stem}.npy"})
+        elif series.map(type).eq(bytes).all() and len(series):
+            lengths = series.map(len).to_numpy(dtype=np.int64)
+            offsets = np.concatenate([[0], np.cumsum(lengths)])
+            np.save(staging / f"{stem}.offsets.npy", offsets)
+            np.save(staging / f"{stem}.npy", np.frombuffer(b''.join(series), dtype=np.uint8))
+            columns.append({'name': column, 'kind': 'binary', 'file': f"{stem}.npy",
+                            'offsets': f"{stem}.offsets.npy"})
+        else:
+            categorical = pd.Categorical(series.astype(str).where(series.notna()))
+            np.save(staging / f"{stem}.npy", categorical.codes)
+            columns.append({'name': column, 'kind': 'category', 'file': f"{stem}.npy",
+                            'categories': [str(c) for c in categorical.categories]})
+
+    manifest = {'name': name, 'version': version, 'rows': len(frame),
+                'columns': columns, 'attrs': {**frame.attrs, **(attrs or {})}}
+    (staging / 'manifest.json').write_text(json.dumps(manifest))
+    try:
+        os.rename(staging, target)
+    except OSError:
+        # Another worker published the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+    _set_current(dataset_dir, version)
+    _prune(dataset_dir, version)
+    return target
+
+def _set_current(dataset_dir, version):
+    pointer = dataset_dir / f".CURRENT.{os.getpid()}"
+    pointer.write_text(version)
+    os.replace(pointer, dataset_dir / 'CURRENT')
+
+def _prune(dataset_dir, current):
+    versions = sorted(
+        (path for path in dataset_dir.iterdir() if path.is_dir() and not path.name.startswith('.')),
+        key=lambda path: path.stat().st_mtime
+    )
+    # Unlinking is safe for attached workers: their mappings stay valid until released
+    for path in versions[:-KEEP_VERSIONS]:
+        if path.name != current:
+            shutil.rmtree(path, ignore_errors=True)
+
+def attach(name, version=None):
+    """Map a published dataset into this process without copying column data.
+
+    Array columns share read-only memory with every other worker on the
+    node. Text columns are Categoricals over the shared codes, and binary
+    columns are Arrow arrays over the shared buffer and offsets.
+    The returned frame is a shallow copy per call, so pages may add columns
+    to it without affecting other sessions.
+    """
+    version = version or current_version(name)
+    if version is None:
+        raise FileNotFoundError(f"Dataset '{name}' has not been published.")
+    key = (name, version)
+    with _attached_lock:
+        if key not in _attached:
+            # Drop mappings of superseded versions of this dataset
+            for stale in [k for k in _attached if k[0] == name]:
+                del _attached[stale]
+            _attached[key] = _map_dataset(_dataset_dir(name) / version)
+        frame = _attached[key]
+    return frame.copy(deep=False)
+
+def _map_dataset(path):
+    manifest = json.loads((path / 'manifest.json').read_text())
+    data = {}
+    for column in manifest['columns']:
+        values = np.load(path / column['file'], mmap_mode='r')
+        if column['kind'] == 'category':
+            data[column['name']] = pd.Categorical.from_codes(values, column['categories'])
+        elif column['kind'] == 'binary':
+            offsets = np.load(path / column['offsets'], mmap_mode='r')
+            data[column['name']] = _binary_column(values, offsets)
+        else:
+            data[column['name']] = values
+    frame = pd.DataFrame(data, copy=False)
+    frame.attrs.update(manifest['attrs'])
+    return frame
+
+def _binary_column(values, offsets):
+    """Wrap a mapped buffer and its offsets as a column of bytes values."""
+    if pa is None:
+        buffer = memoryview(values)
+        return [bytes(buffer[offsets[i]:offsets[i + 1]]) for i in range(len(offsets) - 1)]
+    array = pa.LargeBinaryArray.from_buffers(pa.large_binary(), len(offsets) - 1,
+                                             [None, pa.py_buffer(offsets), pa.py_buffer(values)])
+    return pd.arrays.ArrowExtensionArray(array)
+
+def get_frame(name, sources, build, attrs=None, fingerprint=''):
+    """Return a dataset, publishing it first if its sources or builder have changed.
+
+    `build` is called at most once per version on a node: workers racing to
+    publish serialize on a file lock and re-check the version. Pass a
+    `fingerprint` that changes whenever `build` would produce different data.
+    """
+    version = dataset_version(sources, fingerprint)
+    if current_version(name) != version:
+        _dataset_dir(name).mkdir(parents=True, exist_ok=True)
+        with open(_dataset_dir(name) / '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if current_version(name) != version:
+                publish(name, build(), version, attrs)
+    return attach(name, version)
+
+def load_csv(filename):
+    """Load an asset CSV through the shared store.
+
+    Files with a schema are validated and type-coerced once, when the
+    dataset is published; every reader then gets the typed frame and its
+    validation report in frame.attrs.
+    """
+    path = ASSETS_PATH / filename
+
+    def build():
+        frame = pd.read_csv(path)
+        return schemas.validate(frame, filename) if filename in schemas.SCHEMAS else frame
+
+    fingerprint = schemas.fingerprint(filename) if filename in schemas.SCHEMAS else ''
+    return get_frame(Path(filename).stem, [path], build, fingerprint=fingerprint)
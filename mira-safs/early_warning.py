@@ -0,0 +1,141 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# Each warning fires when all its conditions hold for `duration` consecutive
+# readings of the same crop. Readings are ordered by their id.
+WARNING_RULES = [
+    {'warning': 'Drought', 'duration': 2,
+     'conditions': [('draught_risk', '>=', 70.0), ('soil_moisture', '<', 35.0)]},
+    {'warning': 'Flooding', 'duration': 1,
+     'conditions': [('flooding_risk', '>=', 60.0), ('rain', '>=', 150.0)]},
+    {'warning': 'High Wind', 'duration': 2,
+     'conditions': [('wind', '>=', 120.0)]},
+]
+
+EVENT_COLUMNS = ['id', 'crop_id', 'warning', 'consecutive_readings']
+
+_OPERATORS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+}
+
+def condition_mask(readings, conditions):
+    """Return a boolean array where every condition holds. Missing values never match."""
+    mask = np.ones(len(readings), dtype=bool)
+    for column, op, threshold in conditions:
+        values = readings[column].to_numpy(dtype=float, na_value=np.nan)
+        mask &= _OPERATORS[op](values, threshold)
+    return mask
+
+def run_lengths(groups, mask, carry=None):
+    """Length of the run of consecutive True values ending at each position.
+
+    `groups` must be sorted so each group is contiguous; runs never span a
+    group boundary. `carry` optionally maps a group to the run length it
+    ended on in a previous evaluation, which is added to a run that starts
+    at the beginning of that group.
+    """
+    n = len(mask)
+    idx = np.arange(n)
+    group_start = np.ones(n, dtype=bool)
+    group_start[1:] = groups[1:] != groups[:-1]
+    # Position of the most recent False (or the slot just before the group start)
+    markers = np.where(~mask, idx, np.where(group_start, idx - 1, -1))
+    last_break = np.maximum.accumulate(markers) if n else markers
+    lengths = idx - last_break
+    if carry is not None and n:
+        first = np.maximum.accumulate(np.where(group_start, idx, 0))
+        continues = mask & (last_break == first - 1)
+        previous = pd.Series(groups).map(carry).fillna(0).to_numpy(dtype=np.int64)
+        lengths = np.where(continues, lengths + previous, lengths)
+    return lengths
+
+class EarlyWarningEvaluator:
+    """Evaluate warning rules incrementally over arriving climate readings.
+
+    Only readings with an id above the last one evaluated are processed;
+    the open run length per crop and rule is carried between calls so that
+    sustained conditions spanning batches are still detected.
+
+    Callers may pass either just the new readings or the whole, growing
+    history. When a call includes ids up to the watermark, the reading at
+    the watermark is compared with the one evaluated before; if it is
+    missing or has changed, the source was replaced (e.g. a rewritten file
+    whose ids restart) and the evaluator starts over.
+    """
+
+    def __init__(self, rules=WARNING_RULES, group_column='crop_id', order_column='id'):
+        self.rules = rules
+        self.group_column = group_column
+        self.order_column = order_column
+        # Columns that identify a reading for restart detection
+        self.columns = list(dict.fromkeys([group_column, order_column] +
+                                          [column for rule in rules for column, _, _ in rule['conditions']]))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all readings and warnings evaluated so far."""
+        self.last_id = None
+        self._last_signature = None
+        self.carry = {rule['warning']: pd.Series(dtype=np.int64) for rule in self.rules}
+        self.events = pd.DataFrame(columns=EVENT_COLUMNS)
+
+    def evaluate(self, readings):
+        """Process new readings and return the warning events they raise."""
+        with self._lock:
+            if (self.last_id is not None and len(readings)
+                    and readings[self.order_column].min() <= self.last_id
+                    and self._signature(readings, self.last_id) != self._last_signature):
+                self.reset()
+            if self.last_id is not None:
+                readings = readings[readings[self.order_column] > self.last_id]
+            if readings.empty:
+                return pd.DataFrame(columns=EVENT_COLUMNS)
+
+            readings = readings.sort_values([self.group_column, self.order_column], kind='stable')
+            groups = readings[self.group_column].to_numpy()
+            ids = readings[self.order_column].to_numpy()
+            is_last = np.ones(len(groups), dtype=bool)
+            is_last[:-1] = groups[1:] != groups[:-1]
+
+            batch_events = []
+            for rule in self.rules:
+                name = rule['warning']
+                lengths = run_lengths(groups, condition_mask(readings, rule['conditions']),
+                                      self.carry[name])
+                # A warning is raised once, on the reading where the run reaches its duration
+                fired = lengths == rule['duration']
+                batch_events.append(pd.DataFrame({
+                    'id': ids[fired],
+                    'crop_id': groups[fired],
+                    'warning': name,
+                    'consecutive_readings': lengths[fired],
+                }))
+                ended = pd.Series(lengths[is_last], index=groups[is_last])
+                self.carry[name] = ended.combine_first(self.carry[name]).astype(np.int64)
+
+            if self.last_id is None or ids.max() > self.last_id:
+                self.last_id = ids.max()
+                self._last_signature = self._signature(readings, self.last_id)
+            events = pd.concat(batch_events, ignore_index=True).sort_values('id', kind='stable', ignore_index=True)
+            self.events = pd.concat([self.events, events], ignore_index=True) if not self.events.empty else events
+            return events
+
+    def _signature(self, readings, reading_id):
+        """Hash of the reading with the given id, or None if it is absent or ambiguous."""
+        rows = readings[readings[self.order_column] == reading_id]
+        if len(rows) != 1:
+            return None
+        return int(pd.util.hash_pandas_object(rows[self.columns], index=False).iloc[0])
+
+def rules_table(rules=WARNING_RULES):
+    """Describe the warning rules as a DataFrame for display."""
+    return pd.DataFrame([{
+        'Warning': rule['warning'],
+        'Conditions': ' and '.join(f"{column} {op} {threshold}" for column, op, threshold in rule['conditions']),
+        'Consecutive Readings': rule['duration'],
+    } for rule in rules])
@@ -0,0 +1,252 @@
+import argparse
+import io
+import os
+import streamlit as st
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import schemas
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is offered only when pyarrow is installed
+    pa = pq = None
+
+DEFAULT_CHUNKSIZE = 50_000
+FORMATS = ['CSV', 'Parquet'] if pq is not None else ['CSV']
+
+def iter_row_chunks(source, chunksize=DEFAULT_CHUNKSIZE, start=0, stop=None):
+    """Yield the rows [start, stop) of a source as DataFrame chunks.
+
+    `source` is either a DataFrame, which is sliced without copying, or an
+    iterable of DataFrames such as pd.read_csv(..., chunksize=n), which is
+    consumed lazily and never held in memory as a whole. An empty range
+    yields a single empty chunk so writers can still emit the columns.
+    """
+    if isinstance(source, pd.DataFrame):
+        stop = len(source) if stop is None else min(stop, len(source))
+        if start >= stop:
+            yield source.iloc[0:0]
+            return
+        for offset in range(start, stop, chunksize):
+            yield source.iloc[offset:min(offset + chunksize, stop)]
+        return
+
+    position = 0
+    empty = None
+    for frame in source:
+        if empty is None:
+            empty = frame.iloc[0:0]
+        frame_start, frame_stop = position, position + len(frame)
+        position = frame_stop
+        if frame_stop <= start:
+            continue
+        if stop is not None and frame_start >= stop:
+            break
+        frame = frame.iloc[max(start - frame_start, 0):(len(frame) if stop is None else stop - frame_start)]
+        for offset in range(0, len(frame), chunksize):
+            yield frame.iloc[offset:offset + chunksize]
+            empty = None
+    if empty is not None:
+        yield empty
+
+def iter_csv(source, chunksize=DEFAULT_CHUNKSIZE, start=0, stop=None, header=True):
+    """Stream rows as encoded CSV chunks.
+
+    To resume an interrupted download, pass the number of rows already
+    received as `start` and header=False; the chunks then append cleanly.
+    """
+    for chunk in iter_row_chunks(source, chunksize, start, stop):
+        yield chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back in pieces."""
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._buffer.write(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = self._buffer.getvalue()
+        self._buffer = io.BytesIO()
+        return data
+
+def iter_parquet(source, chunksize=DEFAULT_CHUNKSIZE, start=0, stop=None):
+    """Stream rows as a Parquet file, one row group per chunk.
+
+    Concatenating the yielded pieces gives a valid Parquet file; only one
+    row group is buffered at a time. The schema of a DataFrame source is
+    taken from the whole frame, so a column that is empty in one chunk
+    keeps its type; for chunked sources it comes from the first chunk.
+    """
+    if pq is None:
+        raise RuntimeError("Parquet export requires the 'pyarrow' package.")
+    sink = _ChunkSink()
+    writer = None
+    if isinstance(source, pd.DataFrame):
+        writer = pq.ParquetWriter(sink, pa.Schema.from_pandas(source, preserve_index=False))
+    try:
+        for chunk in iter_row_chunks(source, chunksize, start, stop):
+            if writer is None:
+                writer = pq.ParquetWriter(sink, pa.Schema.from_pandas(chunk, preserve_index=False))
+            if len(chunk):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+            yield sink.drain()
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        yield sink.drain()
+
+def iter_export(source, fmt='CSV', chunksize=DEFAULT_CHUNKSIZE, start=0, stop=None, header=True):
+    """Stream rows in the requested format."""
+    if fmt == 'CSV':
+        return iter_csv(source, chunksize, start, stop, header)
+    if fmt == 'Parquet':
+        return iter_parquet(source, chunksize, start, stop)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+def complete_records(path, block_size=1 << 20):
+    """Count the complete CSV records in a file and truncate any partial last record.
+
+    A record ends at a newline outside double quotes, so quoted fields
+    that contain newlines are counted once. Returns the number of complete
+    records, header included, left in the file.
+    """
+    records, end, offset, in_quotes = 0, 0, 0, False
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            data = np.frombuffer(block, dtype=np.uint8)
+            # Quote parity before each byte; an escaped "" toggles twice and cancels out
+            quoted = (np.cumsum(data == ord('"')) + in_quotes) % 2 == 1
+            ends = np.flatnonzero((data == ord('\n')) & ~quoted)
+            if len(ends):
+                records += len(ends)
+                end = offset + int(ends[-1]) + 1
+            in_quotes = bool(quoted[-1])
+            offset += len(block)
+    if end < offset:
+        os.truncate(path, end)
+    return records
+
+def read_csv_chunks(path, fmt='CSV', chunksize=DEFAULT_CHUNKSIZE):
+    """Lazily read a CSV file in chunks whose dtypes do not vary between chunks.
+
+    Values are read as text, so CSV output reproduces them unchanged. For
+    Parquet, chunks are coerced to the file's schema (text for files or
+    columns without one); per-chunk type inference would otherwise give a
+    column that is empty in the first chunk a type later chunks cannot fit.
+    """
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str):
+        yield chunk if fmt == 'CSV' else schemas.coerce(chunk, Path(path).name)
+
+def write_export(source, path, fmt='CSV', chunksize=DEFAULT_CHUNKSIZE, start=0, stop=None, header=True,
+                 append=False):
+    """Stream rows to a file on disk, appending to it when resuming a CSV export.
+
+    A new file is written under a temporary name and only moved into place
+    once complete, so a failed export never leaves a truncated file behind.
+    """
+    if append:
+        if fmt != 'CSV':
+            raise ValueError("Only CSV exports can be appended to.")
+        with open(path, 'ab') as f:
+            for piece in iter_export(source, fmt, chunksize, start, stop, header):
+                f.write(piece)
+        return
+
+    path = Path(path)
+    staging = path.with_name(f".{path.name}.{os.getpid()}.part")
+    try:
+        with open(staging, 'wb') as f:
+            for piece in iter_export(source, fmt, chunksize, start, stop, header):
+                f.write(piece)
+        os.replace(staging, path)
+    except BaseException:
+        staging.unlink(missing_ok=True)
+        raise
+
+def export_section(datasets, key):
+    """Render export controls for the given {name: DataFrame} datasets on a page."""
+    with st.expander("Export Data"):
+        name = st.selectbox("Dataset", list(datasets), key=f"{key}_export_dataset")
+        frame = datasets[name]
+        fmt = st.radio("Format", FORMATS, horizontal=True, key=f"{key}_export_format")
+        col1, col2 = st.columns(2)
+        with col1:
+            start = st.number_input("First row", min_value=0, max_value=len(frame), value=0,
+                                    key=f"{key}_export_start")
+        with col2:
+            stop = st.number_input("Last row (exclusive)", min_value=0, max_value=len(frame), value=len(frame),
+                                   key=f"{key}_export_stop")
+        # A non-zero first row with no header lets a partial CSV download be resumed by appending
+        header = st.checkbox("Include CSV header", value=True, key=f"{key}_export_header") if fmt == 'CSV' else True
+
+        if start > stop:
+            st.error("The first row must not come after the last row.")
+            return
+
+        # The file is only encoded on request, not on every rerun of the page
+        if st.button("Prepare download", key=f"{key}_export_prepare"):
+            data = b''.join(iter_export(frame, fmt, start=int(start), stop=int(stop), header=header))
+            extension = 'csv' if fmt == 'CSV' else 'parquet'
+            st.download_button(
+                f"Download {name} ({int(start)}-{int(stop)})",
+                data=data,
+                file_name=f"{name.lower().replace(' ', '_')}_{int(start)}_{int(stop)}.{extension}",
+                mime='text/csv' if fmt == 'CSV' else 'application/octet-stream',
+                key=f"{key}_export_download"
+            )
+
+def main():
+    """Export a CSV source in chunks without loading it into memory."""
+    parser = argparse.ArgumentParser(description="Stream a dataset to CSV or Parquet in chunks.")
+    parser.add_argument('source', help="Path to the source CSV file")
+    parser.add_argument('output', help="Path to the output file")
+    parser.add_argument('--format', choices=['CSV', 'Parquet'], default='CSV')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--start', type=int, default=0, help="First row to export")
+    parser.add_argument('--stop', type=int, default=None, help="Row to stop before")
+    parser.add_argument('--resume', action='store_true',
+                        help="Append to an existing CSV output, starting after the rows it already holds")
+    args = parser.parse_args()
+
+    start, header, append = args.start, True, False
+    if args.resume:
+        if args.format != 'CSV':
+            parser.error("--resume is only supported for CSV output.")
+        # An interrupted write may end mid-record; that record is dropped and written again
+        written = complete_records(args.output)
+        if written:
+            # Subtract the header line from the rows already written
+            start, header, append = args.start + written - 1, False, True
+
+    source = read_csv_chunks(args.source, args.format, args.chunksize)
+    write_export(source, args.output, args.format, args.chunksize, start, args.stop, header, append)
+
+if __name__ == "__main__":
+    main()
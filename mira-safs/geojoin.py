@@ -0,0 +1,161 @@
+import threading
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+import datastore
+import geojson_stream
+
+EARTH_RADIUS_M = 6371008.8
+
+# Spacing of samples interpolated along field boundaries
+BOUNDARY_SPACING_M = 25.0
+
+DEFAULT_BATCH_SIZE = 100_000
+
+# Recognised names for point coordinate columns
+LATITUDE_COLUMNS = ['latitude', 'lat']
+LONGITUDE_COLUMNS = ['longitude', 'lon', 'lng', 'long']
+
+def _haversine_m(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+def boundary_samples(vertices, spacing=BOUNDARY_SPACING_M):
+    """Densify field outlines into points no more than `spacing` metres apart.
+
+    `vertices` has Name, Longitude and Latitude columns listing each
+    field's ring in order. Returns the same columns for the samples.
+    """
+    names = vertices['Name'].to_numpy()
+    lon = vertices['Longitude'].to_numpy(dtype=float)
+    lat = vertices['Latitude'].to_numpy(dtype=float)
+    # Segments join consecutive vertices of the same field
+    same = names[1:] == names[:-1]
+    start_lon, start_lat, end_lon, end_lat = lon[:-1][same], lat[:-1][same], lon[1:][same], lat[1:][same]
+    segment_names = names[:-1][same]
+
+    steps = np.maximum(np.ceil(_haversine_m(start_lat, start_lon, end_lat, end_lon) / spacing), 1).astype(int)
+    segment = np.repeat(np.arange(len(steps)), steps)
+    # Fraction along each segment, excluding its end vertex (the next segment's start)
+    offsets = np.arange(len(segment)) - np.repeat(np.cumsum(steps) - steps, steps)
+    fraction = offsets / steps[segment]
+    samples = pd.DataFrame({
+        'Name': segment_names[segment],
+        'Longitude': start_lon[segment] + fraction * (end_lon[segment] - start_lon[segment]),
+        'Latitude': start_lat[segment] + fraction * (end_lat[segment] - start_lat[segment]),
+    })
+    return pd.concat([samples, vertices[['Name', 'Longitude', 'Latitude']]], ignore_index=True)
+
+def vertices_from_fields(fields):
+    """Flatten polygon exterior rings of a GeoDataFrame into Name/Longitude/Latitude rows."""
+    fields = fields.to_crs(epsg=4326) if fields.crs is not None else fields
+    rows = []
+    for name, geometry in zip(fields['name'], fields.geometry):
+        polygons = getattr(geometry, 'geoms', [geometry])
+        for polygon in polygons:
+            for lon, lat in polygon.exterior.coords:
+                rows.append((name, lon, lat))
+    return pd.DataFrame(rows, columns=['Name', 'Longitude', 'Latitude'])
+
+def vertices_from_features(features):
+    """Flatten polygon exterior rings of GeoJSON features into Name/Longitude/Latitude rows.
+
+    Features without a 'name' property are named by their position, as in
+    the geometry cache; non-polygon geometries are skipped.
+    """
+    rows = []
+    for position, feature in enumerate(features):
+        geometry = feature.get('geometry') or {}
+        name = (feature.get('properties') or {}).get('name')
+        name = str(position) if name is None else str(name)
+        if geometry.get('type') == 'Polygon':
+            polygons = [geometry['coordinates']]
+        elif geometry.get('type') == 'MultiPolygon':
+            polygons = geometry['coordinates']
+        else:
+            continue
+        for polygon in polygons:
+            if polygon:
+                rows.extend((name, point[0], point[1]) for point in polygon[0])
+    return pd.DataFrame(rows, columns=['Name', 'Longitude', 'Latitude'])
+
+class FieldIndex:
+    """BallTree over field centroids and boundary samples using the haversine metric."""
+
+    def __init__(self, vertices, spacing=BOUNDARY_SPACING_M):
+        vertices = vertices.dropna(subset=['Longitude', 'Latitude'])
+        centroids = (vertices.drop_duplicates(['Name', 'Longitude', 'Latitude'])
+                     .groupby('Name', sort=False)[['Longitude', 'Latitude']].mean().reset_index())
+        samples = pd.concat([boundary_samples(vertices, spacing), centroids], ignore_index=True)
+        self.centroids = centroids
+        self.labels = samples['Name'].to_numpy()
+        self.tree = BallTree(np.radians(samples[['Latitude', 'Longitude']].to_numpy(dtype=float)),
+                             metric='haversine')
+
+    @classmethod
+    def from_csv(cls, path, spacing=BOUNDARY_SPACING_M):
+        """Build the index from a Name, Longitude, Latitude vertex file such as field.csv."""
+        return cls(pd.read_csv(path), spacing)
+
+    @classmethod
+    def from_geojson(cls, path, spacing=BOUNDARY_SPACING_M):
+        """Build the index from the polygon features of a WGS84 GeoJSON file, streamed one at a time."""
+        return cls(vertices_from_features(geojson_stream.iter_features(path)), spacing)
+
+    def nearest(self, lat, lon):
+        """Return the nearest field name and distance in metres for each point."""
+        points = np.radians(np.column_stack([np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)]))
+        distance, index = self.tree.query(points, k=1)
+        return self.labels[index[:, 0]], distance[:, 0] * EARTH_RADIUS_M
+
+    def assign(self, points, lat_column='latitude', lon_column='longitude', max_distance_m=None,
+               batch_size=DEFAULT_BATCH_SIZE):
+        """Assign a stream of point frames to fields, yielding one enriched frame per batch.
+
+        `points` is a DataFrame or an iterable of DataFrames (e.g. a chunked
+        CSV reader). Points farther than `max_distance_m` from every field,
+        and points without coordinates, get no field.
+        """
+        frames = [points] if isinstance(points, pd.DataFrame) else points
+        for frame in frames:
+            for offset in range(0, len(frame), batch_size):
+                batch = frame.iloc[offset:offset + batch_size].copy()
+                valid = batch[lat_column].notna().to_numpy() & batch[lon_column].notna().to_numpy()
+                field = np.full(len(batch), None, dtype=object)
+                distance = np.full(len(batch), np.nan)
+                if valid.any():
+                    field[valid], distance[valid] = self.nearest(batch.loc[valid, lat_column],
+                                                                 batch.loc[valid, lon_column])
+                if max_distance_m is not None:
+                    field[~(distance <= max_distance_m)] = None
+                batch['field'] = field
+                batch['field_distance_m'] = distance
+                yield batch
+
+    def assign_frame(self, frame, lat_column='latitude', lon_column='longitude', max_distance_m=None,
+                     batch_size=DEFAULT_BATCH_SIZE):
+        """Assign every point of a DataFrame to its nearest field."""
+        batches = list(self.assign(frame, lat_column, lon_column, max_distance_m, batch_size))
+        return pd.concat(batches) if batches else frame.assign(field=None, field_distance_m=np.nan)
+
+_index_cache = {}
+_index_lock = threading.Lock()
+
+def get_field_index(csv_path=None):
+    """Return a FieldIndex built from field.csv, rebuilt only when the file changes."""
+    csv_path = csv_path or datastore.ASSETS_PATH / 'field.csv'
+    key = (str(csv_path), datastore.source_version([csv_path]))
+    with _index_lock:
+        if key not in _index_cache:
+            _index_cache.clear()
+            _index_cache[key] = FieldIndex.from_csv(csv_path)
+        return _index_cache[key]
+
+def coordinate_columns(frame):
+    """Return the (latitude, longitude) column names of a frame, or None if it has no coordinates."""
+    lookup = {str(column).lower(): column for column in frame.columns}
+    lat = next((lookup[name] for name in LATITUDE_COLUMNS if name in lookup), None)
+    lon = next((lookup[name] for name in LONGITUDE_COLUMNS if name in lookup), None)
+    return (lat, lon) if lat and lon else None
@@ -0,0 +1,315 @@
+import json
+import os
+import re
+import struct
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import datastore
+
+EARTH_RADIUS_M = 6378137.0
+
+DEFAULT_BATCH_SIZE = 1000
+BLOCK_SIZE = 1 << 20
+
+# Header of the binary geometry cache: magic then, per feature,
+# name length (uint32), name (UTF-8), area in hectares (float64), WKB length (uint32), WKB
+CACHE_MAGIC = b'MIRAWKB1'
+CACHE_DIR = datastore.STORE_ROOT / 'geometry'
+
+# CRS names equivalent to GeoJSON's default lon/lat WGS84
+WGS84_NAMES = {'urn:ogc:def:crs:OGC:1.3:CRS84', 'urn:ogc:def:crs:EPSG::4326', 'EPSG:4326'}
+
+_WHITESPACE = b' \t\r\n'
+_SCALAR_END = re.compile(rb'[\s,\]}]')
+_QUOTE, _BACKSLASH = ord('"'), ord('\\')
+# Depth change of each byte: +1 for an opening bracket, -1 for a closing one
+_BRACKETS = np.zeros(256, dtype=np.int8)
+_BRACKETS[[ord('{'), ord('[')]] = 1
+_BRACKETS[[ord('}'), ord(']')]] = -1
+
+class _Reader:
+    """Byte buffer over a binary file that is refilled on demand.
+
+    Objects, arrays and strings are scanned once, block by block, with the
+    bracket depth and string/escape state carried across blocks; each value
+    is decoded only when it is complete, so a value spanning many blocks
+    costs time linear in its size.
+    """
+
+    def __init__(self, f, block_size):
+        self.f = f
+        self.block_size = block_size
+        self.buffer = bytearray()
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        block = self.f.read(self.block_size)
+        if not block:
+            self.eof = True
+            return False
+        # Drop consumed bytes so the buffer never grows beyond the current value
+        del self.buffer[:self.pos]
+        self.buffer += block
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it, or '' at EOF."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return chr(self.buffer[self.pos])
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Invalid GeoJSON: expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def _scan(self, data, state):
+        """Scan a chunk of a container or string value; return the offset just past its end, or None.
+
+        `state` holds the depth, whether the scan is inside a string and
+        whether the first byte is escaped, and is updated for the next chunk.
+        """
+        quotes = np.flatnonzero(data == _QUOTE)
+        backslashes = np.flatnonzero(data == _BACKSLASH)
+        if len(backslashes) or state['escaped']:
+            # Backslashes only occur inside strings and each escapes the byte after it
+            escaped = [0] if state['escaped'] else []
+            for i in backslashes.tolist():
+                if not escaped or escaped[-1] != i:
+                    escaped.append(i + 1)
+            state['escaped'] = bool(escaped) and escaped[-1] == len(data)
+            quotes = quotes[~np.isin(quotes, escaped)]
+        if state['string']:
+            # The string ends at its closing quote
+            closing = 0 if state['in_string'] else 1
+            if len(quotes) > closing:
+                return int(quotes[closing]) + 1
+        else:
+            brackets = np.flatnonzero(_BRACKETS[data])
+            # Brackets preceded by an odd number of quotes are inside a string
+            inside = (np.searchsorted(quotes, brackets) + state['in_string']) % 2 == 1
+            brackets = brackets[~inside]
+            depth = np.cumsum(_BRACKETS[data[brackets]], dtype=np.int64) + state['depth']
+            done = np.flatnonzero(depth == 0)
+            if len(done):
+                return int(brackets[done[0]]) + 1
+            if len(depth):
+                state['depth'] = int(depth[-1])
+        state['in_string'] = (len(quotes) + state['in_string']) % 2 == 1
+        return None
+
+    def value(self):
+        """Decode the next complete JSON value, reading more of the file as needed."""
+        first = self.peek()
+        if first in '{["':
+            state = {'depth': 0, 'in_string': False, 'escaped': False, 'string': first == '"'}
+            scanned = 0
+            while True:
+                end = self._scan(np.frombuffer(self.buffer, dtype=np.uint8)[self.pos + scanned:], state)
+                if end is not None:
+                    end += self.pos + scanned
+                    break
+                scanned = len(self.buffer) - self.pos
+                if not self._fill():
+                    raise ValueError("Invalid GeoJSON: unexpected end of file")
+        else:
+            # Numbers and literals end at a delimiter, which may only arrive with the next block
+            while True:
+                match = _SCALAR_END.search(self.buffer, self.pos)
+                if match or self.eof:
+                    end = match.start() if match else len(self.buffer)
+                    break
+                self._fill()
+        text = bytes(self.buffer[self.pos:end])
+        self.pos = end
+        return json.loads(text)
+
+def iter_features(path, block_size=BLOCK_SIZE):
+    """Yield the features of a GeoJSON FeatureCollection one at a time.
+
+    Only the feature being decoded (plus one read block) is held in memory.
+    Raises ValueError for a non-WGS84 'crs' member that precedes the features.
+    """
+    with open(path, 'rb') as f:
+        reader = _Reader(f, block_size)
+        reader.expect('{')
+        while reader.peek() != '}':
+            key = reader.value()
+            reader.expect(':')
+            if key == 'features':
+                reader.expect('[')
+                while reader.peek() != ']':
+                    yield reader.value()
+                    if reader.peek() == ',':
+                        reader.pos += 1
+                reader.pos += 1
+            else:
+                value = reader.value()
+                if key == 'crs':
+                    name = (value or {}).get('properties', {}).get('name')
+                    if name is not None and name not in WGS84_NAMES:
+                        raise ValueError(f"Unsupported GeoJSON CRS: {name}")
+            if reader.peek() == ',':
+                reader.pos += 1
+            elif reader.peek() == '':
+                raise ValueError("Invalid GeoJSON: unexpected end of file")
+
+def iter_batches(path, batch_size=DEFAULT_BATCH_SIZE, block_size=BLOCK_SIZE):
+    """Yield lists of at most `batch_size` features."""
+    batch = []
+    for feature in iter_features(path, block_size):
+        batch.append(feature)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _polygons(geometry):
+    """Return the polygons (lists of rings) of a Polygon or MultiPolygon geometry."""
+    if not geometry:
+        return []
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+def areas_ha(features):
+    """Planar EPSG:3857 area in hectares of each feature, matching GeoSeries.area after to_crs(3857).
+
+    All rings in the batch are projected and measured with the shoelace
+    formula in one vectorized pass; holes are subtracted from their shell.
+    """
+    coords, ring_feature, ring_sign = [], [], []
+    for index, feature in enumerate(features):
+        for polygon in _polygons(feature.get('geometry')):
+            for ring_index, ring in enumerate(polygon):
+                if len(ring) < 3:
+                    continue
+                coords.append(np.asarray(ring, dtype=float)[:, :2])
+                ring_feature.append(index)
+                ring_sign.append(1.0 if ring_index == 0 else -1.0)
+    areas = np.zeros(len(features))
+    if not coords:
+        return areas
+
+    lengths = np.array([len(ring) for ring in coords])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    points = np.concatenate(coords)
+    x = EARTH_RADIUS_M * np.radians(points[:, 0])
+    y = EARTH_RADIUS_M * np.log(np.tan(np.pi / 4 + np.radians(points[:, 1]) / 2))
+    # Pair every vertex with the next one in its ring, wrapping to the ring's first vertex
+    following = np.arange(1, len(points) + 1)
+    following[starts + lengths - 1] = starts
+    cross = x * y[following] - x[following] * y
+    ring_areas = np.abs(np.add.reduceat(cross, starts)) / 2
+    np.add.at(areas, np.array(ring_feature), ring_areas * np.array(ring_sign))
+    return areas / 10000
+
+def _wkb_points(points):
+    points = np.asarray(points, dtype=float)
+    points = points[:, :2] if len(points) else points.reshape(0, 2)
+    return struct.pack('<I', len(points)) + points.astype('<f8').tobytes()
+
+def to_wkb(geometry):
+    """Encode a GeoJSON geometry as 2-D little-endian WKB."""
+    if not geometry:
+        return struct.pack('<BII', 1, 7, 0)  # Empty GeometryCollection
+    kind, coords = geometry['type'], geometry.get('coordinates')
+    if kind == 'Point':
+        return struct.pack('<BI', 1, 1) + np.asarray(coords[:2], dtype='<f8').tobytes()
+    if kind == 'LineString':
+        return struct.pack('<BI', 1, 2) + _wkb_points(coords)
+    if kind == 'Polygon':
+        return struct.pack('<BII', 1, 3, len(coords)) + b''.join(_wkb_points(ring) for ring in coords)
+    if kind in ('MultiPoint', 'MultiLineString', 'MultiPolygon'):
+        part = kind[len('Multi'):]
+        return struct.pack('<BII', 1, {'MultiPoint': 4, 'MultiLineString': 5, 'MultiPolygon': 6}[kind], len(coords)) + \
+            b''.join(to_wkb({'type': part, 'coordinates': c}) for c in coords)
+    if kind == 'GeometryCollection':
+        parts = geometry.get('geometries', [])
+        return struct.pack('<BII', 1, 7, len(parts)) + b''.join(to_wkb(g) for g in parts)
+    raise ValueError(f"Unsupported geometry type: {kind}")
+
+def cache_path(path):
+    """Location of the binary geometry cache for the current version of a GeoJSON file."""
+    return CACHE_DIR / f"{Path(path).stem}-{datastore.source_version([path])}.wkb"
+
+def build_cache(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Stream a GeoJSON file into the binary cache, one batch at a time. Returns the cache path."""
+    target = cache_path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = target.with_name(f".{target.name}.{os.getpid()}")
+    position = 0
+    try:
+        with open(staging, 'wb') as out:
+            out.write(CACHE_MAGIC)
+            for batch in iter_batches(path, batch_size):
+                for feature, area in zip(batch, areas_ha(batch)):
+                    name = (feature.get('properties') or {}).get('name')
+                    name = (str(position) if name is None else str(name)).encode('utf-8')
+                    wkb = to_wkb(feature.get('geometry'))
+                    out.write(struct.pack('<I', len(name)) + name + struct.pack('<dI', area, len(wkb)) + wkb)
+                    position += 1
+    except BaseException:
+        staging.unlink(missing_ok=True)
+        raise
+    os.replace(staging, target)
+    _prune(path, target)
+    return target
+
+def _prune(path, current):
+    """Remove caches of superseded versions of a GeoJSON file, keeping the newest few."""
+    pattern = re.compile(re.escape(Path(path).stem) + r'-[0-9a-f]{16}\.wkb')
+    versions = sorted((cache for cache in CACHE_DIR.iterdir() if pattern.fullmatch(cache.name)),
+                      key=lambda cache: cache.stat().st_mtime)
+    # Readers holding an open cache keep reading it after it is unlinked
+    for cache in versions[:-datastore.KEEP_VERSIONS]:
+        if cache != current:
+            cache.unlink(missing_ok=True)
+
+def iter_cache(path, batch_size=DEFAULT_BATCH_SIZE, geometry=True):
+    """Yield DataFrames of name, area_ha and (optionally) WKB geometry from the cache.
+
+    The cache is built by streaming the GeoJSON first if it is missing or stale.
+    """
+    target = cache_path(path)
+    if not target.is_file():
+        build_cache(path, batch_size)
+    with open(target, 'rb') as f:
+        if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+            raise ValueError(f"Not a geometry cache: {target}")
+        rows = []
+        while True:
+            header = f.read(4)
+            if not header:
+                break
+            name = f.read(struct.unpack('<I', header)[0]).decode('utf-8')
+            area, length = struct.unpack('<dI', f.read(12))
+            if geometry:
+                rows.append((name, area, f.read(length)))
+            else:
+                f.seek(length, os.SEEK_CUR)
+                rows.append((name, area))
+            if len(rows) == batch_size:
+                yield _cache_frame(rows, geometry)
+                rows = []
+        if rows:
+            yield _cache_frame(rows, geometry)
+
+def _cache_frame(rows, geometry):
+    return pd.DataFrame(rows, columns=['name', 'area_ha', 'geometry'] if geometry else ['name', 'area_ha'])
+
+def area_table(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Return the name and area in hectares of every feature, without loading geometries."""
+    frames = list(iter_cache(path, batch_size, geometry=False))
+    return pd.concat(frames, ignore_index=True) if frames else _cache_frame([], False)
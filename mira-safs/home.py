@@ -1,5 +1,6 @@
 import streamlit as st
 from pathlib import Path
+import images
 
 def load_image_path():
     """Return the absolute path to the image."""
@@ -19,9 +20,14 @@ def app():
     # Load the image path
     image_path = load_image_path()
 
-    # Display the main image or show an error if the image is not found
+    # Display the main image or show an error if the image is not found.
+    # Serve the smallest cached derivative that covers the column (?width=<px> overrides the default).
     if image_path:
-        st.image(image_path, use_column_width=True)
+        try:
+            column_width = int(st.query_params.get("width", images.DEFAULT_COLUMN_WIDTH))
+        except ValueError:
+            column_width = images.DEFAULT_COLUMN_WIDTH
+        st.image(images.get_image(image_path, column_width), width='stretch')
     else:
         st.error("Image not found. Please check the 'assets/field.jpg' path and try again.")
 
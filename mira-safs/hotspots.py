@@ -0,0 +1,154 @@
+import re
+import numpy as np
+import pandas as pd
+from scipy import ndimage
+
+EARTH_RADIUS_M = 6378137.0
+
+# Cells per side of the density raster
+GRID_SIZE = 200
+
+# Gaussian kernel bandwidth in metres
+BANDWIDTH_M = 150.0
+
+# Records at or below this NDVI count towards low-vegetation clusters
+LOW_NDVI_THRESHOLD = 0.3
+
+# Share of the peak density a cell needs to belong to a cluster
+CLUSTER_LEVEL = 0.25
+
+# Share of the peak density a cell needs to be drawn on a heat layer,
+# and the most cells drawn per layer
+HEAT_LEVEL = 0.05
+MAX_HEAT_POINTS = 2000
+
+def to_web_mercator(lon, lat):
+    """Project lon/lat degrees to EPSG:3857 metres."""
+    lon, lat = np.radians(lon), np.radians(lat)
+    return EARTH_RADIUS_M * lon, EARTH_RADIUS_M * np.log(np.tan(np.pi / 4 + lat / 2))
+
+def from_web_mercator(x, y):
+    """Unproject EPSG:3857 metres to lon/lat degrees."""
+    return np.degrees(x / EARTH_RADIUS_M), np.degrees(2 * np.arctan(np.exp(y / EARTH_RADIUS_M)) - np.pi / 2)
+
+def field_ids(name):
+    """Return the record ids a field name refers to, e.g. 'field3_4' -> [3, 4]."""
+    return [int(number) for number in re.findall(r'\d+', str(name))]
+
+def attach_to_fields(pest_data, fields, id_column='id'):
+    """Join pest records to field centroids.
+
+    Records are matched on an explicit 'field' column when present, and
+    otherwise on their id against the number(s) in each field's name.
+    Returns the matched records with x/y centroid columns in EPSG:3857.
+    """
+    projected = fields.to_crs(epsg=3857)
+    centroids = pd.DataFrame({
+        'field': projected['name'].astype(str).values,
+        'x': projected.geometry.centroid.x.values,
+        'y': projected.geometry.centroid.y.values,
+    })
+    if 'field' in pest_data.columns:
+        return pest_data.merge(centroids, on='field')
+    lookup = pd.DataFrame(
+        [(number, name) for name in centroids['field'] for number in field_ids(name)],
+        columns=[id_column, 'field']
+    ).drop_duplicates(id_column)
+    return pest_data.merge(lookup, on=id_column).merge(centroids, on='field')
+
+def _gaussian_matrix(centers, bandwidth):
+    """Dense smoothing matrix applying a 1-D Gaussian along one raster axis."""
+    distance = centers[:, None] - centers[None, :]
+    return np.exp(-0.5 * (distance / bandwidth) ** 2)
+
+def density_grid(x, y, weights, bounds, grid_size=GRID_SIZE, bandwidth=BANDWIDTH_M):
+    """Gaussian kernel density of weighted points on a regular raster.
+
+    Points are binned once, then smoothed with the separable kernel as two
+    matrix products, so cost depends on the grid size, not the point count.
+    Returns (density, x_centers, y_centers) with density indexed [y, x].
+    """
+    xmin, ymin, xmax, ymax = bounds
+    x_edges = np.linspace(xmin, xmax, grid_size + 1)
+    y_edges = np.linspace(ymin, ymax, grid_size + 1)
+    counts, _, _ = np.histogram2d(y, x, bins=[y_edges, x_edges], weights=weights)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    density = _gaussian_matrix(y_centers, bandwidth) @ counts @ _gaussian_matrix(x_centers, bandwidth).T
+    return density, x_centers, y_centers
+
+def label_clusters(density, level=CLUSTER_LEVEL):
+    """Label 4-connected regions of cells at or above `level` times the peak."""
+    if not density.size or density.max() <= 0:
+        return np.zeros(density.shape, dtype=int), 0
+    return ndimage.label(density >= level * density.max())
+
+def _cell_index(values, low, high, grid_size):
+    """Raster cell index of each coordinate along one axis."""
+    return np.clip(((values - low) / (high - low) * grid_size).astype(int), 0, grid_size - 1)
+
+def _grid_points(density, x_centers, y_centers, min_share=HEAT_LEVEL, max_points=MAX_HEAT_POINTS):
+    """The densest cells above a share of the peak, as lon/lat points for a heat layer."""
+    if not density.size or density.max() <= 0:
+        return pd.DataFrame(columns=['lat', 'lon', 'value'])
+    rows, cols = np.nonzero(density >= min_share * density.max())
+    if len(rows) > max_points:
+        densest = np.argpartition(density[rows, cols], -max_points)[-max_points:]
+        rows, cols = rows[densest], cols[densest]
+    lon, lat = from_web_mercator(x_centers[cols], y_centers[rows])
+    return pd.DataFrame({'lat': lat, 'lon': lon, 'value': density[rows, cols] / density.max()})
+
+def compute_hotspots(pest_data, fields, grid_size=GRID_SIZE, bandwidth=BANDWIDTH_M,
+                     ndvi_threshold=LOW_NDVI_THRESHOLD):
+    """Compute damage hotspots and low-NDVI clusters over the field extent.
+
+    Returns a dict with heat layer points for damaged area and low NDVI,
+    a table of low-NDVI clusters, and the number of matched records.
+    """
+    records = attach_to_fields(pest_data, fields)
+    projected = fields.to_crs(epsg=3857)
+    xmin, ymin, xmax, ymax = projected.total_bounds
+    pad = 3 * bandwidth
+    bounds = (xmin - pad, ymin - pad, xmax + pad, ymax + pad)
+    # Never smooth below the cell size, or large extents would render as isolated cells
+    bandwidth = max(bandwidth, (bounds[2] - bounds[0]) / grid_size, (bounds[3] - bounds[1]) / grid_size)
+
+    x, y = records['x'].to_numpy(), records['y'].to_numpy()
+    damage, x_centers, y_centers = density_grid(
+        x, y, records['area_damaged'].to_numpy(dtype=float), bounds, grid_size, bandwidth)
+
+    low_ndvi = records['ndvi'].to_numpy(dtype=float) <= ndvi_threshold
+    ndvi_density, _, _ = density_grid(x[low_ndvi], y[low_ndvi], None, bounds, grid_size, bandwidth)
+
+    labels, count = label_clusters(ndvi_density)
+    clusters = []
+    if count:
+        cell_rows, cell_cols = np.nonzero(labels)
+        cell_labels = labels[cell_rows, cell_cols]
+        # Assign each low-NDVI record to the cluster of the cell it falls in
+        record_cols = _cell_index(x[low_ndvi], bounds[0], bounds[2], grid_size)
+        record_rows = _cell_index(y[low_ndvi], bounds[1], bounds[3], grid_size)
+        record_labels = labels[record_rows, record_cols]
+        record_fields = records['field'].to_numpy()[low_ndvi]
+        for label in range(1, count + 1):
+            in_cluster = cell_labels == label
+            lon, lat = from_web_mercator(x_centers[cell_cols[in_cluster]].mean(),
+                                         y_centers[cell_rows[in_cluster]].mean())
+            members = record_labels == label
+            clusters.append({
+                'Cluster': label,
+                'Latitude': float(lat),
+                'Longitude': float(lon),
+                'Records': int(members.sum()),
+                'Fields': ', '.join(sorted(set(record_fields[members]))),
+                'Peak Density': float(ndvi_density[labels == label].max()),
+            })
+
+    return {
+        'damage_points': _grid_points(damage, x_centers, y_centers),
+        'low_ndvi_points': _grid_points(ndvi_density, x_centers, y_centers),
+        'clusters': pd.DataFrame(clusters, columns=['Cluster', 'Latitude', 'Longitude', 'Records',
+                                                    'Fields', 'Peak Density']),
+        'matched_records': len(records),
+        'total_records': len(pest_data),
+    }
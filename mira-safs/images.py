@@ -0,0 +1,116 @@
+import io
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+import datastore
+
+# Derivative widths in pixels; a request is served from the smallest bucket that covers it
+WIDTH_BUCKETS = (320, 640, 960, 1280, 1920)
+
+# Assumed content column width when the client does not report one
+DEFAULT_COLUMN_WIDTH = 1280
+
+# Images pre-generated by `python images.py`
+IMAGES = ['field.jpg', 'logo.png', 'gbrgeojson.png']
+
+# Derivatives live next to the shared dataset store so every worker on the node reuses them
+CACHE_DIR = Path(os.environ.get('MIRA_IMAGE_CACHE_DIR', datastore.STORE_ROOT / 'images'))
+
+WEBP_SUPPORTED = features.check('webp')
+
+_build_lock = threading.Lock()
+
+def bucket_width(column_width):
+    """Return the smallest bucket at least as wide as the column, or the largest bucket."""
+    for width in WIDTH_BUCKETS:
+        if width >= column_width:
+            return width
+    return WIDTH_BUCKETS[-1]
+
+def _output_format(source_format):
+    if WEBP_SUPPORTED:
+        return 'WEBP'
+    # Without WebP, keep PNG for sources that may carry transparency
+    return 'PNG' if source_format == 'PNG' else 'JPEG'
+
+def derivative_path(source, width):
+    """Path of the cached derivative for a source image and bucket width."""
+    source = Path(source)
+    version = datastore.source_version([source])
+    extension = 'webp' if WEBP_SUPPORTED else ('png' if source.suffix.lower() == '.png' else 'jpg')
+    return CACHE_DIR / f"{source.stem}-{width}w-{version}.{extension}"
+
+def build_derivative(source, width):
+    """Encode a derivative no wider than `width` and write it to the cache.
+
+    Images narrower than the bucket are re-encoded at their own width rather
+    than upscaled. Returns the derivative path.
+    """
+    target = derivative_path(source, width)
+    if target.is_file():
+        return target
+
+    with Image.open(source) as image:
+        output_format = _output_format(image.format)
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        if output_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        buffer = io.BytesIO()
+        if output_format == 'WEBP':
+            image.save(buffer, 'WEBP', quality=80, method=6)
+        elif output_format == 'JPEG':
+            image.save(buffer, 'JPEG', quality=82, optimize=True, progressive=True)
+        else:
+            image.save(buffer, 'PNG', optimize=True)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    staging = target.with_name(f".{target.name}.{os.getpid()}")
+    staging.write_bytes(buffer.getvalue())
+    os.replace(staging, target)
+    _prune(source, width, target)
+    return target
+
+def _prune(source, width, current):
+    """Remove derivatives of superseded versions of a source at one width, keeping the newest few."""
+    pattern = re.compile(re.escape(Path(source).stem) + rf'-{width}w-[0-9a-f]{{16}}\.(webp|png|jpg)')
+    versions = sorted((path for path in CACHE_DIR.iterdir() if pattern.fullmatch(path.name)),
+                      key=lambda path: path.stat().st_mtime)
+    # Workers that already read a derivative serve it from memory
+    for path in versions[:-datastore.KEEP_VERSIONS]:
+        if path != current:
+            path.unlink(missing_ok=True)
+
+@lru_cache(maxsize=64)
+def _encoded(source, width, version):
+    with _build_lock:
+        return build_derivative(source, width).read_bytes()
+
+def get_image(source, column_width=DEFAULT_COLUMN_WIDTH):
+    """Return encoded bytes of the smallest derivative that fits the column.
+
+    Derivatives are generated on first request and the bytes are then
+    shared by every session in the process.
+    """
+    source = Path(source)
+    return _encoded(str(source), bucket_width(column_width), datastore.source_version([source]))
+
+def build_all(names=IMAGES):
+    """Generate every bucket for the given asset images."""
+    for name in names:
+        source = datastore.ASSETS_PATH / name
+        try:
+            for width in WIDTH_BUCKETS:
+                path = build_derivative(source, width)
+                print(f"{path} ({path.stat().st_size} bytes)")
+        except (UnidentifiedImageError, OSError) as e:
+            print(f"Skipping {source}: {e}")
+
+if __name__ == "__main__":
+    build_all()
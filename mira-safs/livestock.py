@@ -1,20 +1,27 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-from pathlib import Path
+import export
+import datastore
+import schemas
+from aggregations import vaccine_counts, disease_counts
 
 def load_data():
-    # Define the path to the 'assets' directory
-    assets_path = Path(__file__).parent / 'assets'
-    
-    # Load the CSV files from the 'assets' directory
-    livestock_data = pd.read_csv(assets_path / 'livestock_data.csv')
-    health_check_data = pd.read_csv(assets_path / 'health_check_data.csv')
+    # Load the CSV files from the 'assets' directory through the shared store
+    livestock_data = datastore.load_csv('livestock_data.csv')
+    health_check_data = datastore.load_csv('health_check_data.csv')
     return livestock_data, health_check_data
 
 def app():
-    # Load data
-    livestock_data, health_check_data = load_data()
+    # Load data; frames arrive validated and typed from the shared store
+    try:
+        livestock_data, health_check_data = load_data()
+    except schemas.SchemaError as e:
+        st.error(f"Error loading data: {e}")
+        return
+    for frame in (livestock_data, health_check_data):
+        message = schemas.issues_message(frame)
+        if message:
+            st.warning(message)
 
     # Create tabs
     tabs = st.tabs(["Livestock Overview", "Animal Health Check"])
@@ -64,24 +71,20 @@ def app():
         with col1:
             st.subheader("Vaccines Administered")
             # Count the number of vaccines administered
-            vaccines_count = health_check_data['vaccines'].value_counts().reset_index()
-            vaccines_count.columns = ['Vaccine', 'Count']
+            vaccines_count = vaccine_counts(health_check_data)
             fig = px.bar(vaccines_count, x='Vaccine', y='Count', title="Vaccines Administered")
             st.plotly_chart(fig)
 
         with col2:
             st.subheader("Diseases Diagnosed")
             # Count the occurrences of each disease
-            diseases_series = health_check_data['diseases'].str.split(',', expand=True).stack()
-            diseases_count = diseases_series.value_counts().reset_index()
-            diseases_count.columns = ['Disease', 'Count']
+            diseases_count = disease_counts(health_check_data)
             fig = px.bar(diseases_count, x='Disease', y='Count', title="Diseases Diagnosed")
             st.plotly_chart(fig)
 
         with row1:
             st.subheader("Health Check Trends Over Time")
-            # Convert check_date to datetime and plot trends
-            health_check_data['check_date'] = pd.to_datetime(health_check_data['check_date'])
+            # Plot health checks by date
             fig = px.line(health_check_data, x='check_date', y='id', title="Health Check Trends Over Time", markers=True)
             st.plotly_chart(fig)
 
@@ -95,5 +98,12 @@ def app():
                              title="Vaccines vs Diseases", labels={'vaccines': 'Number of Vaccines', 'diseases': 'Number of Diseases'})
             st.plotly_chart(fig)
 
+    export.export_section({
+        'Livestock': livestock_data,
+        'Health Checks': health_check_data,
+        'Vaccines Administered': vaccines_count,
+        'Diseases Diagnosed': diseases_count
+    }, key='livestock')
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,226 @@
+import argparse
+import json
+import math
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent
+MAIN_SCRIPT = APP_DIR / 'main.py'
+
+# Pages in the order they appear in main.py's menu
+PAGES = ["Home", "About", "Crops", "Livestock", "Maps", "Emission", "Weather"]
+
+# Columns renumbered when assets are scaled up, so joins on them still match
+ID_COLUMNS = ['id', 'livestock_id', 'crop_id']
+
+def generate_synthetic_assets(target_dir, scale):
+    """Write a copy of the assets with every CSV repeated `scale` times.
+
+    Every file's ids are offset by the same amount per copy, so the
+    crops/soil/fertilizer joins remain one-to-one within each copy.
+    Non-CSV assets are copied unchanged.
+    """
+    import pandas as pd
+
+    source_dir = APP_DIR / 'assets'
+    target_dir = Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    frames = {}
+    for path in source_dir.iterdir():
+        if path.suffix == '.csv':
+            frames[path] = pd.read_csv(path)
+        elif path.is_file():
+            shutil.copy2(path, target_dir / path.name)
+    # One stride for all files; per-file strides would pair different rows across joins
+    stride = max((int(frame[c].max()) for frame in frames.values() for c in ID_COLUMNS
+                  if c in frame.columns and frame[c].notna().any()), default=0)
+    for path, frame in frames.items():
+        with open(target_dir / path.name, 'w', newline='') as f:
+            for copy in range(scale):
+                chunk = frame.copy()
+                for column in ID_COLUMNS:
+                    if column in chunk.columns:
+                        chunk[column] += copy * stride
+                chunk.to_csv(f, index=False, header=copy == 0)
+    return target_dir
+
+def current_rss():
+    """Resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # ru_maxrss is the peak so far (KiB on Linux), the best available fallback
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class RssSampler(threading.Thread):
+    """Sample RSS periodically and record how far it rises during each render.
+
+    A render's growth is the highest RSS seen while it ran minus the RSS
+    when it started, so memory retained by earlier renders is not counted
+    against later pages. With concurrent sessions, renders of other pages
+    running at the same time still contribute to the growth.
+    """
+
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = defaultdict(list)
+        self.start_rss = current_rss()
+        self.peak_rss = self.start_rss
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def enter(self, page):
+        """Start tracking a render; returns a token for leave()."""
+        rss = current_rss()
+        token = object()
+        with self._lock:
+            self._active[token] = [page, rss, rss]
+        return token
+
+    def leave(self, token):
+        rss = current_rss()
+        with self._lock:
+            page, started, peak = self._active.pop(token)
+            self.growth[page].append(max(peak, rss) - started)
+            self.peak_rss = max(self.peak_rss, rss)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            rss = current_rss()
+            with self._lock:
+                self.peak_rss = max(self.peak_rss, rss)
+                for render in self._active.values():
+                    render[2] = max(render[2], rss)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    rank = min(max(math.ceil(q / 100 * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[rank]
+
+def run_session(session_index, pages, iterations, sampler, timeout):
+    """Drive one headless session through the menu and return per-page latencies.
+
+    Each session starts at a different page so concurrent sessions do not
+    all render the same page at once. Every render executes all of the
+    page's tabs, as st.tabs runs each tab body on every rerun.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(MAIN_SCRIPT), default_timeout=timeout)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    order = pages[session_index % len(pages):] + pages[:session_index % len(pages)]
+    for _ in range(iterations):
+        for page in order:
+            app.query_params['page'] = page
+            token = sampler.enter(page)
+            started = time.perf_counter()
+            try:
+                app.run()
+                failed = bool(app.exception)
+            except Exception:
+                failed = True
+            latencies[page].append(time.perf_counter() - started)
+            sampler.leave(token)
+            if failed:
+                errors[page] += 1
+    return latencies, errors
+
+def run_level(concurrency, pages, iterations, timeout):
+    """Run `concurrency` sessions at once and summarize them per page."""
+    sampler = RssSampler()
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda index: run_session(index, pages, iterations, sampler, timeout),
+            range(concurrency)
+        ))
+    elapsed = time.perf_counter() - started
+    sampler.stop()
+
+    report = {'concurrency': concurrency, 'elapsed_s': elapsed, 'pages': {},
+              'start_rss_mb': sampler.start_rss / 2 ** 20, 'peak_rss_mb': sampler.peak_rss / 2 ** 20}
+    total_renders = 0
+    for page in pages:
+        latencies = [value for session, _ in results for value in session[page]]
+        errors = sum(session_errors[page] for _, session_errors in results)
+        total_renders += len(latencies)
+        report['pages'][page] = {
+            'renders': len(latencies),
+            'errors': errors,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'p50_rss_growth_mb': percentile(sampler.growth[page], 50) / 2 ** 20,
+            'max_rss_growth_mb': max(sampler.growth[page], default=float('nan')) / 2 ** 20,
+        }
+    report['throughput_rps'] = total_renders / elapsed if elapsed else float('nan')
+    return report
+
+def print_report(report):
+    print(f"\nConcurrency {report['concurrency']}: "
+          f"{report['throughput_rps']:.2f} renders/s over {report['elapsed_s']:.1f}s")
+    print(f"Process RSS {report['start_rss_mb']:.1f} MB at start, {report['peak_rss_mb']:.1f} MB peak")
+    print(f"{'Page':<12}{'Renders':>8}{'Errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'p50 +RSS MB':>13}{'Max +RSS MB':>13}")
+    for page, stats in report['pages'].items():
+        print(f"{page:<12}{stats['renders']:>8}{stats['errors']:>8}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+              f"{stats['p50_rss_growth_mb']:>13.1f}{stats['max_rss_growth_mb']:>13.1f}")
+    print("+RSS: growth of process RSS during a render over its value when the render started; "
+          "with concurrency above 1 it includes overlapping renders of other pages.")
+
+def main():
+    """Measure render latency, throughput and memory at increasing concurrency."""
+    parser = argparse.ArgumentParser(description="Headless load test for the Mira pages.")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Numbers of simultaneous sessions to test")
+    parser.add_argument('--iterations', type=int, default=3,
+                        help="Passes each session makes through the pages")
+    parser.add_argument('--pages', nargs='+', choices=PAGES, default=PAGES)
+    parser.add_argument('--synthetic-scale', type=int, default=0,
+                        help="Repeat every CSV asset this many times before testing")
+    parser.add_argument('--timeout', type=float, default=120, help="Seconds allowed per render")
+    parser.add_argument('--json', help="Also write the reports to this JSON file")
+    args = parser.parse_args()
+
+    if args.synthetic_scale:
+        workdir = Path(tempfile.mkdtemp(prefix='mira-loadtest-'))
+        os.environ['MIRA_ASSETS_DIR'] = str(generate_synthetic_assets(workdir / 'assets', args.synthetic_scale))
+        # Keep synthetic datasets out of the node's production store
+        os.environ['MIRA_STORE_DIR'] = str(workdir / 'store')
+
+    # The pages import their sibling modules by name
+    sys.path.insert(0, str(APP_DIR))
+
+    reports = []
+    for concurrency in args.concurrency:
+        report = run_level(concurrency, args.pages, args.iterations, args.timeout)
+        print_report(report)
+        reports.append(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -22,14 +22,20 @@ class MultiApp:
         })
 
     def run(self):
+        titles = [app["title"] for app in self.apps]
+
+        # Allow linking to a page with ?page=<title>; also used by the load tester
+        requested_page = st.query_params.get("page")
+        default_index = titles.index(requested_page) if requested_page in titles else 0
+
         # Display the sidebar for navigation
         with st.sidebar:
             selected_app_title = option_menu(
                 menu_title='Mira',
-                options=[app["title"] for app in self.apps],
+                options=titles,
                 icons=['house-fill', 'crops', 'sheep', 'satellite', 'cloud_upload', 'cloud_', 'personfill', 'infocircle'],
                 menu_icon='local-florist',
-                default_index=0,
+                default_index=default_index,
                 styles={
                     "container": {"padding": "5!important", "background-color": '#2f3030'},
                     "icon": {"color": "white", "font-size": "21px"},
@@ -38,6 +44,9 @@ class MultiApp:
                 }
             )
 
+        # The menu component has no value until it renders in a browser (e.g. headless runs)
+        selected_app_title = selected_app_title or titles[default_index]
+
         # Route to the selected page in the main content area
         for app_dict in self.apps:
             if app_dict["title"] == selected_app_title:
@@ -6,6 +6,11 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 import warnings
+import export
+import datastore
+import hotspots
+import geojson_stream
+import aggregations
 
 # Suppress specific warnings
 warnings.filterwarnings('ignore', category=UserWarning)
@@ -22,35 +27,42 @@ def assign_colors(df, color_column):
     available_colors = generate_colors(num_unique_values)
     return dict(zip(unique_values, available_colors))
 
+def load_fields(geojson_path):
+    """Load field names, areas and WKB geometries through the shared store."""
+    def build():
+        # Read from the binary geometry cache, which is streamed from the GeoJSON on first use
+        frame = pd.concat(geojson_stream.iter_cache(geojson_path), ignore_index=True)
+        frame.attrs['crs'] = 'EPSG:4326'
+        return frame
+
+    frame = datastore.get_frame(Path(geojson_path).stem + '_geometries', [geojson_path], build)
+    return gpd.GeoDataFrame(
+        frame.drop(columns='geometry'),
+        geometry=gpd.GeoSeries.from_wkb(frame['geometry']),
+        crs=frame.attrs.get('crs')
+    )
+
+# Simplification tolerance of the field map layer, in degrees (about 1 m)
+LAYER_TOLERANCE = 1e-5
+
+@st.cache_resource
+def load_field_layer(geojson_path, version):
+    """Build the field map layer once per source version from the cached geometries."""
+    fields = load_fields(geojson_path)[['name', 'geometry']]
+    fields['name'] = fields['name'].astype(str)
+    fields['geometry'] = fields.geometry.simplify(LAYER_TOLERANCE, preserve_topology=True)
+    return fields
+
+@st.cache_data
+def load_hotspots(geojson_path, version):
+    """Compute pest hotspots once per version of the field and pest sources."""
+    pest_data = datastore.load_csv('pest_pathogen_data.csv')
+    return hotspots.compute_hotspots(pest_data, load_fields(geojson_path))
+
 def analyze_area_statistics(geojson_path):
     """Analyze area statistics from GeoJSON."""
     try:
-        gdf = gpd.read_file(geojson_path)
-        
-        if 'name' not in gdf.columns:
-            st.warning("Expected column 'name' not found in GeoJSON file. Using default column names.")
-            gdf['name'] = gdf.index.astype(str)
-        
-        if gdf.crs is None:
-            st.error("CRS (Coordinate Reference System) is not defined in the GeoJSON file.")
-            return {}, pd.DataFrame()
-        
-        if gdf.crs.to_string() != 'EPSG:3857':
-            gdf = gdf.to_crs(epsg=3857)
-        
-        gdf['area_ha'] = gdf['geometry'].area / 10000
-        
-        total_area_ha = gdf['area_ha'].sum()
-        num_features = len(gdf)
-        
-        areas = gdf[['name', 'area_ha']]
-        
-        stats = {
-            'Total Area (hectares)': total_area_ha,
-            'Number of Features': num_features
-        }
-        
-        return stats, areas
+        return aggregations.area_statistics(geojson_path)
     except Exception as e:
         st.error(f"Error analyzing area statistics: {e}")
         return {}, pd.DataFrame()
@@ -77,18 +89,24 @@ def app():
     map_height = 700
 
     # Define path to the GeoJSON file using pathlib
-    assets_path = Path(__file__).parent / 'assets'
+    assets_path = datastore.ASSETS_PATH
     regions_path = assets_path / 'field.geojson'
 
     stats, areas = analyze_area_statistics(regions_path)
+    field_layer = None
+    if regions_path.is_file():
+        try:
+            field_layer = load_field_layer(str(regions_path), datastore.source_version([regions_path]))
+        except Exception as e:
+            st.error(f"Error loading field geometries: {e}")
     
     color_map = assign_colors(areas, 'name')
-    areas['color'] = areas['name'].map(color_map)
+    areas['color'] = areas['name'].astype(str).map(color_map)
     areas = areas.sort_values(by='name')
 
     st.subheader("Map Controls")
 
-    tab1, tab2 = st.tabs(["Marker Cluster", "WMS Layers"])
+    tab1, tab2, tab3 = st.tabs(["Marker Cluster", "WMS Layers", "Pest Hotspots"])
 
     with tab1:
         st.write("### Marker Cluster")
@@ -96,10 +114,10 @@ def app():
 
         if not regions_path.is_file():
             st.error(f"GeoJSON file not found: {regions_path}")
-        else:
+        elif field_layer is not None:
             try:
                 m_marker.add_geojson(
-                    str(regions_path),
+                    field_layer,
                     layer_name='Farm fields',
                     style_function=lambda feature: {
                         'fillColor': color_map.get(feature['properties']['name'], '#grey'),
@@ -148,6 +166,40 @@ def app():
 
             m_wms.to_streamlit(width=map_width, height=map_height)
 
+    with tab3:
+        st.write("### Pest and Pathogen Hotspots")
+        st.markdown(
+            """
+            Pest and pathogen records are attached to their fields and smoothed into a density raster.
+            The damage layer is weighted by area damaged; the low NDVI layer counts records with
+            NDVI at or below %.2f. Connected areas of high low-NDVI density are listed as clusters.
+            """ % hotspots.LOW_NDVI_THRESHOLD
+        )
+        pest_path = assets_path / 'pest_pathogen_data.csv'
+        if not regions_path.is_file() or not pest_path.is_file():
+            st.error("Field or pest/pathogen data not found.")
+        else:
+            try:
+                result = load_hotspots(str(regions_path), datastore.source_version([regions_path, pest_path]))
+                st.caption(f"{result['matched_records']} of {result['total_records']} records matched to a field.")
+
+                m_heat = leafmap.Map(center=[40, -100], zoom=4)
+                if field_layer is not None:
+                    m_heat.add_geojson(field_layer, layer_name='Farm fields',
+                                       style={'color': 'black', 'weight': 1, 'fillOpacity': 0})
+                if not result['damage_points'].empty:
+                    m_heat.add_heatmap(result['damage_points'], latitude='lat', longitude='lon',
+                                       value='value', name='Area damaged', radius=15)
+                if not result['low_ndvi_points'].empty:
+                    m_heat.add_heatmap(result['low_ndvi_points'], latitude='lat', longitude='lon',
+                                       value='value', name='Low NDVI', radius=15)
+                m_heat.to_streamlit(width=map_width, height=map_height)
+
+                st.write("#### Low NDVI Clusters")
+                st.dataframe(result['clusters'], hide_index=True, width='stretch')
+            except Exception as e:
+                st.error(f"Error computing pest hotspots: {e}")
+
     st.subheader("Field Sizes Analysis")
 
     if not areas.empty:
@@ -166,6 +218,8 @@ def app():
     st.write("### Area Statistics")
     st.json(stats)
 
+    export.export_section({'Field Areas': areas[['name', 'area_ha']]}, key='maps')
+
 if __name__ == "__main__":
     app()
 
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+
+# Expected columns and types of each asset file. Columns listed under
+# 'nullable' may be empty; any other missing or unparseable value marks the row invalid.
+SCHEMAS = {
+    'emissions_data.csv': {
+        'columns': {'Farm_ID': 'str', 'Farming_Practice': 'str', 'Emissions_Type': 'str',
+                    'Emissions_Amount': 'float', 'Energy_Source': 'str', 'Farming_Type': 'str',
+                    'Crop': 'str', 'Date': 'datetime'},
+        'nullable': ['Farm_ID', 'Farming_Type', 'Crop'],
+    },
+    'crops_data.csv': {
+        'columns': {'id': 'int', 'type': 'str', 'field_size': 'float', 'location': 'str',
+                    'production': 'float'},
+        'nullable': ['location'],
+    },
+    'soil_data.csv': {
+        'columns': {'id': 'int', 'soil_nitrogen': 'float', 'soil_phosphorus': 'float',
+                    'soil_potassium': 'float', 'soil_moisture': 'float', 'soil_ph': 'float',
+                    'organic_matter': 'float', 'recommendation': 'str'},
+        'nullable': ['recommendation'],
+    },
+    'pest_pathogen_data.csv': {
+        'columns': {'id': 'int', 'pest_name': 'str', 'pathogen_name': 'str', 'area_damaged': 'float',
+                    'status': 'str', 'ndvi': 'float'},
+        'nullable': ['pest_name', 'pathogen_name', 'ndvi'],
+    },
+    'fertilizers_data.csv': {
+        'columns': {'id': 'int', 'type': 'str', 'name': 'str', 'quantity': 'float'},
+        'nullable': ['name'],
+    },
+    'livestock_data.csv': {
+        'columns': {'id': 'int', 'tag_number': 'str', 'animal': 'str', 'dateofbirth': 'datetime',
+                    'gender': 'str', 'pregnant': 'bool', 'age(months)': 'int'},
+        'nullable': ['tag_number'],
+    },
+    'health_check_data.csv': {
+        'columns': {'id': 'int', 'livestock_id': 'int', 'vaccines': 'str', 'diseases': 'str',
+                    'check_date': 'datetime'},
+        'nullable': [],
+    },
+    'climate_data.csv': {
+        'columns': {'id': 'int', 'air_temperature': 'float', 'soil_temperature': 'float',
+                    'soil_moisture': 'float', 'air_moisture': 'float', 'rain': 'float', 'wind': 'float',
+                    'draught_risk': 'float', 'flooding_risk': 'float', 'crop_id': 'int'},
+        'nullable': [],
+    },
+}
+
+# Nullable dtypes that stay the same in every chunk of a file, whatever values a chunk holds
+STABLE_DTYPES = {'float': 'float64', 'int': 'Int64', 'bool': 'boolean', 'str': 'string',
+                 'datetime': 'datetime64[ns]'}
+
+# Number of invalid row positions kept in a report
+SAMPLE_ROWS = 10
+
+_TRUE = {'true', 't', 'yes', 'y', '1'}
+_FALSE = {'false', 'f', 'no', 'n', '0'}
+
+class SchemaError(ValueError):
+    """Raised when a dataset is missing required columns."""
+
+def _coerce(series, dtype):
+    """Return the series converted to dtype, with unparseable values as missing."""
+    if dtype == 'float':
+        return pd.to_numeric(series, errors='coerce').astype(float)
+    if dtype == 'int':
+        values = pd.to_numeric(series, errors='coerce')
+        # Non-integral numbers are invalid rather than silently truncated
+        return values.where(values.isna() | (values % 1 == 0))
+    if dtype == 'datetime':
+        return pd.to_datetime(series, errors='coerce')
+    if dtype == 'bool':
+        if series.dtype == bool:
+            return series
+        text = series.astype(str).str.strip().str.lower()
+        return pd.Series(np.select([text.isin(_TRUE), text.isin(_FALSE)], [True, False], None),
+                         index=series.index, dtype=object)
+    if dtype == 'str':
+        text = series.astype(str).str.strip()
+        return text.where(series.notna() & (text != ''))
+    raise ValueError(f"Unknown schema type: {dtype}")
+
+def _finalize(series, dtype):
+    """Cast a coerced series to its final dtype once invalid rows are gone."""
+    # Nullable int/bool columns with gaps keep their float/object representation
+    if dtype == 'int' and series.notna().all():
+        return series.astype(np.int64)
+    if dtype == 'bool' and series.notna().all():
+        return series.astype(bool)
+    return series
+
+def validate(frame, name, columns=None):
+    """Check and coerce a frame against the schema of the named asset.
+
+    Every column is converted in one vectorized pass. Rows with a missing
+    or unparseable value in a non-nullable column are dropped and counted
+    per column. The returned frame is stamped with a report in
+    frame.attrs['validation']. Only the given columns are checked when
+    `columns` is passed (e.g. for a usecols subset). Raises SchemaError if
+    expected columns are absent.
+    """
+    schema = SCHEMAS[name]
+    expected = {column: dtype for column, dtype in schema['columns'].items()
+                if columns is None or column in columns}
+    missing = [column for column in expected if column not in frame.columns]
+    if missing:
+        raise SchemaError(f"{name} is missing column(s): {', '.join(missing)}")
+
+    frame = frame.copy()
+    invalid = np.zeros(len(frame), dtype=bool)
+    errors = {}
+    for column, dtype in expected.items():
+        coerced = _coerce(frame[column], dtype)
+        bad = coerced.isna().to_numpy()
+        if column in schema['nullable']:
+            # Empty values are allowed, values that fail to parse are not
+            bad = np.zeros_like(bad) if dtype == 'str' else bad & frame[column].notna().to_numpy()
+        if bad.any():
+            errors[column] = int(bad.sum())
+            invalid |= bad
+        frame[column] = coerced
+
+    # 1-based positions of invalid data rows in the source
+    sample = (np.flatnonzero(invalid)[:SAMPLE_ROWS] + 1).tolist()
+    frame = frame[~invalid].reset_index(drop=True)
+    for column, dtype in expected.items():
+        frame[column] = _finalize(frame[column], dtype)
+
+    frame.attrs['validation'] = {
+        'schema': name,
+        'rows': int(len(frame) + invalid.sum()),
+        'invalid_rows': int(invalid.sum()),
+        'errors': errors,
+        'sample_rows': [int(row) for row in sample],
+    }
+    return frame
+
+def coerce(frame, name=None):
+    """Convert a chunk to stable nullable dtypes without dropping any rows.
+
+    Columns of the named schema get their declared type, with unparseable
+    values as missing; all other columns become strings. Every chunk of a
+    file then has the same dtypes, e.g. for a multi-chunk Parquet export.
+    """
+    columns = SCHEMAS[name]['columns'] if name in SCHEMAS else {}
+    frame = frame.copy()
+    for column in frame.columns:
+        dtype = columns.get(column)
+        series = _coerce(frame[column], dtype) if dtype else frame[column]
+        frame[column] = series.astype(STABLE_DTYPES[dtype] if dtype else 'string')
+    return frame
+
+def fingerprint(name):
+    """Return a short hash of the named schema, so data validated under another schema is not reused."""
+    return hashlib.sha1(json.dumps(SCHEMAS[name], sort_keys=True).encode()).hexdigest()[:16]
+
+def is_validated(frame):
+    """Return whether a frame has been through validate()."""
+    return 'validation' in frame.attrs
+
+def issues_message(frame):
+    """Describe rows dropped at validation, or return None if there were none."""
+    report = frame.attrs.get('validation')
+    if not report or not report['invalid_rows']:
+        return None
+    columns = ', '.join(f"{column} ({count})" for column, count in report['errors'].items())
+    return (f"{report['invalid_rows']} of {report['rows']} rows in {report['schema']} were skipped "
+            f"because of invalid values in: {columns}. First affected rows: "
+            f"{', '.join(str(row) for row in report['sample_rows'])}.")
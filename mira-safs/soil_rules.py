@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+# Declarative threshold rules, in the order their advice appears in a recommendation
+SOIL_RULES = [
+    {'column': 'soil_nitrogen', 'op': '<', 'threshold': 20.0,
+     'recommendation': 'Increase nitrogen levels through fertilization.'},
+    {'column': 'soil_phosphorus', 'op': '<', 'threshold': 15.0,
+     'recommendation': 'Apply phosphorus-rich fertilizers.'},
+    {'column': 'soil_potassium', 'op': '<', 'threshold': 25.0,
+     'recommendation': 'Add potassium supplements.'},
+    {'column': 'soil_moisture', 'op': '<', 'threshold': 30.0,
+     'recommendation': 'Improve irrigation to increase soil moisture.'},
+    {'column': 'soil_ph', 'op': 'outside', 'threshold': (6.0, 7.5),
+     'recommendation': 'Adjust soil pH to optimal range (6.0-7.5).'},
+    {'column': 'organic_matter', 'op': '<', 'threshold': 5.0,
+     'recommendation': 'Increase organic matter through compost or green manure.'},
+]
+
+OPTIMAL_RECOMMENDATION = 'Soil conditions are optimal.'
+
+_OPERATORS = {
+    '<': lambda values, threshold: values < threshold,
+    '<=': lambda values, threshold: values <= threshold,
+    '>': lambda values, threshold: values > threshold,
+    '>=': lambda values, threshold: values >= threshold,
+    'outside': lambda values, bounds: (values < bounds[0]) | (values > bounds[1]),
+}
+
+def compile_rules(rules=SOIL_RULES):
+    """Compile rules into a function mapping a soil frame to a rule bitmask.
+
+    Bit i of the returned integer array is set where rule i fires. Missing
+    values never fire a rule.
+    """
+    if len(rules) > 63:
+        raise ValueError("At most 63 soil rules are supported.")
+    checks = []
+    for rule in rules:
+        if rule['op'] not in _OPERATORS:
+            raise ValueError(f"Unknown operator {rule['op']!r} in rule for {rule['column']!r}.")
+        checks.append((rule['column'], _OPERATORS[rule['op']], rule['threshold']))
+
+    def evaluate(frame):
+        mask = np.zeros(len(frame), dtype=np.int64)
+        for bit, (column, operator, threshold) in enumerate(checks):
+            values = frame[column].to_numpy(dtype=float, na_value=np.nan)
+            mask |= operator(values, threshold).astype(np.int64) << bit
+        return mask
+
+    return evaluate
+
+def recommend(frame, rules=SOIL_RULES):
+    """Return a recommendation per soil sample as a Series aligned to frame.
+
+    Rows are reduced to a rule bitmask in one vectorized pass; the text is
+    then built once per distinct bitmask rather than once per row.
+    """
+    mask = compile_rules(rules)(frame)
+    codes, inverse = np.unique(mask, return_inverse=True)
+    texts = []
+    for code in codes:
+        fired = [rule['recommendation'] for bit, rule in enumerate(rules) if code >> bit & 1]
+        texts.append(' '.join(fired) if fired else OPTIMAL_RECOMMENDATION)
+    return pd.Series(np.asarray(texts, dtype=object)[inverse], index=frame.index, name='recommendation')
+
+def rules_table(rules=SOIL_RULES):
+    """Describe the rule set as a DataFrame for display."""
+    rows = []
+    for rule in rules:
+        if rule['op'] == 'outside':
+            condition = f"{rule['column']} outside {rule['threshold'][0]}-{rule['threshold'][1]}"
+        else:
+            condition = f"{rule['column']} {rule['op']} {rule['threshold']}"
+        rows.append({'Condition': condition, 'Recommendation': rule['recommendation']})
+    return pd.DataFrame(rows)
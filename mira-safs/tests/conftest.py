@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The app modules are flat files next to main.py and import each other by name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep test datasets out of the node's shared store
+os.environ.setdefault('MIRA_STORE_DIR', tempfile.mkdtemp(prefix='mira-test-store-'))
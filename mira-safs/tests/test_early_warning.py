@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import early_warning
+from early_warning import EarlyWarningEvaluator, run_lengths
+
+def random_readings(seed, n=400, crops=5):
+    """Climate readings with conditions that often hold for a few readings in a row."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'crop_id': rng.integers(1, crops + 1, n),
+        'draught_risk': rng.choice([50.0, 80.0], n, p=[0.3, 0.7]),
+        'soil_moisture': rng.choice([20.0, 50.0], n, p=[0.7, 0.3]),
+        'flooding_risk': rng.choice([30.0, 70.0], n),
+        'rain': rng.choice([100.0, 200.0], n),
+        'wind': rng.choice([80.0, 130.0], n, p=[0.4, 0.6]),
+    })
+
+def test_run_lengths_reset_on_false_and_group_change():
+    groups = np.array([1, 1, 1, 1, 2, 2, 3])
+    mask = np.array([True, True, False, True, True, True, False])
+    np.testing.assert_array_equal(run_lengths(groups, mask), [1, 2, 0, 1, 1, 2, 0])
+
+def test_run_lengths_carry_extends_only_leading_runs():
+    groups = np.array([1, 1, 2, 2, 3])
+    mask = np.array([True, True, False, True, True])
+    carry = pd.Series({1: 3, 2: 5, 3: 0})
+    np.testing.assert_array_equal(run_lengths(groups, mask, carry), [4, 5, 0, 1, 1])
+
+def test_run_lengths_empty():
+    assert len(run_lengths(np.array([]), np.array([], dtype=bool), pd.Series(dtype=np.int64))) == 0
+
+@pytest.mark.parametrize('seed', range(10))
+def test_split_batches_match_single_pass(seed):
+    readings = random_readings(seed)
+    expected = EarlyWarningEvaluator().evaluate(readings)
+    assert not expected.empty
+
+    rng = np.random.default_rng(seed + 100)
+    cuts = np.sort(rng.choice(np.arange(1, len(readings)), size=12, replace=False))
+    evaluator = EarlyWarningEvaluator()
+    bounds = zip(np.concatenate([[0], cuts]), np.concatenate([cuts, [len(readings)]]))
+    batches = [evaluator.evaluate(readings.iloc[start:stop]) for start, stop in bounds]
+    combined = pd.concat(batches, ignore_index=True)
+
+    pd.testing.assert_frame_equal(combined, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(evaluator.events, expected, check_dtype=False)
+
+def test_growing_frame_only_evaluates_new_readings():
+    readings = random_readings(1)
+    evaluator = EarlyWarningEvaluator()
+    for stop in (100, 250, len(readings)):
+        evaluator.evaluate(readings.iloc[:stop])
+    assert evaluator.evaluate(readings).empty
+    pd.testing.assert_frame_equal(evaluator.events, EarlyWarningEvaluator().evaluate(readings), check_dtype=False)
+
+def test_restarted_ids_reset_the_evaluator():
+    evaluator = EarlyWarningEvaluator()
+    evaluator.evaluate(random_readings(2))
+    replacement = random_readings(3, n=120)
+    events = evaluator.evaluate(replacement)
+    expected = EarlyWarningEvaluator().evaluate(replacement)
+    pd.testing.assert_frame_equal(events, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(evaluator.events, expected, check_dtype=False)
+
+def test_warning_fires_once_when_duration_is_reached():
+    rules = [{'warning': 'High Wind', 'duration': 2, 'conditions': [('wind', '>=', 120.0)]}]
+    readings = pd.DataFrame({'id': [1, 2, 3, 4, 5], 'crop_id': 1, 'wind': [130.0, 130.0, 130.0, 50.0, 130.0]})
+    evaluator = EarlyWarningEvaluator(rules)
+    evaluator.evaluate(readings.iloc[:1])
+    events = evaluator.evaluate(readings.iloc[1:])
+    assert events[['id', 'consecutive_readings']].values.tolist() == [[2, 2]]
+    assert early_warning.rules_table(rules)['Consecutive Readings'].tolist() == [2]
+
+def test_replaced_history_with_higher_ids_resets_the_evaluator():
+    evaluator = EarlyWarningEvaluator()
+    evaluator.evaluate(random_readings(4, n=200))
+    # A rewritten file that reuses ids 1..200 with different values and continues past them
+    replacement = random_readings(5, n=300)
+    events = evaluator.evaluate(replacement)
+    expected = EarlyWarningEvaluator().evaluate(replacement)
+    pd.testing.assert_frame_equal(events, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(evaluator.events, expected, check_dtype=False)
+
+def test_appended_history_is_not_rescanned():
+    readings = random_readings(6)
+    evaluator = EarlyWarningEvaluator()
+    evaluator.evaluate(readings.iloc[:300])
+    events = evaluator.evaluate(readings)
+    # Only readings past the watermark raise new events
+    assert (events['id'] > 300).all()
+    pd.testing.assert_frame_equal(evaluator.events, EarlyWarningEvaluator().evaluate(readings), check_dtype=False)
@@ -0,0 +1,86 @@
+import io
+
+import pandas as pd
+import pytest
+
+import export
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+def read_parquet(data):
+    return pq.read_table(io.BytesIO(data))
+
+def test_dataframe_schema_covers_chunks_with_missing_values():
+    frame = pd.DataFrame({'a': pd.Series([None, 'x', 'y'], dtype=object), 'b': [1, 2, 3]})
+    table = read_parquet(b''.join(export.iter_parquet(frame, chunksize=1)))
+    assert table.column('a').to_pylist() == [None, 'x', 'y']
+
+def test_empty_range_keeps_header_and_schema():
+    frame = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+    assert b''.join(export.iter_csv(frame, start=2)) == b'a,b\n'
+    assert read_parquet(b''.join(export.iter_parquet(frame, start=2))).schema.names == ['a', 'b']
+
+def test_csv_chunks_with_late_text_export_to_parquet(tmp_path):
+    source = tmp_path / 'readings.csv'
+    source.write_text('a,b\n,1\n,2\n,3\nx,4\ny,5\n')
+    output = tmp_path / 'readings.parquet'
+    export.write_export(export.read_csv_chunks(source, 'Parquet', chunksize=2), output, 'Parquet', chunksize=2)
+    table = pq.read_table(output)
+    assert table.column('a').to_pylist() == [None, None, None, 'x', 'y']
+    assert table.column('b').to_pylist() == ['1', '2', '3', '4', '5']
+
+def test_csv_chunks_use_the_asset_schema(tmp_path):
+    source = tmp_path / 'pest_pathogen_data.csv'
+    # ndvi is blank in the first chunk only
+    source.write_text('id,pest_name,pathogen_name,area_damaged,status,ndvi\n'
+                      '1,Aphid,,2.5,Active,\n'
+                      '2,,Blight,1.0,Contained,0.42\n')
+    output = tmp_path / 'pests.parquet'
+    export.write_export(export.read_csv_chunks(source, 'Parquet', chunksize=1), output, 'Parquet', chunksize=1)
+    table = pq.read_table(output)
+    assert str(table.schema.field('id').type) == 'int64'
+    assert table.column('ndvi').to_pylist() == [None, 0.42]
+    assert table.column('pest_name').to_pylist() == ['Aphid', None]
+
+def test_csv_export_reproduces_source_text(tmp_path):
+    source = tmp_path / 'values.csv'
+    source.write_text('a,b\n007,1.50\n,x\n')
+    output = tmp_path / 'out.csv'
+    export.write_export(export.read_csv_chunks(source, 'CSV', chunksize=1), output, 'CSV', chunksize=1)
+    assert output.read_text() == source.read_text()
+
+def test_failed_export_leaves_no_file(tmp_path):
+    def chunks():
+        yield pd.DataFrame({'a': [1]})
+        raise OSError('source went away')
+
+    output = tmp_path / 'out.parquet'
+    with pytest.raises(OSError):
+        export.write_export(chunks(), output, 'Parquet')
+    assert list(tmp_path.iterdir()) == []
+
+def run_cli(monkeypatch, *args):
+    monkeypatch.setattr('sys.argv', ['export.py', *map(str, args)])
+    export.main()
+
+def test_complete_records_ignores_quoted_newlines_and_truncates_partial_record(tmp_path):
+    path = tmp_path / 'partial.csv'
+    path.write_bytes(b'a,b\n1,"two\nlines"\n2,"say ""hi"""\n3,"unfinished\n')
+    assert export.complete_records(path, block_size=3) == 3
+    assert path.read_bytes() == b'a,b\n1,"two\nlines"\n2,"say ""hi"""\n'
+
+def test_resume_after_interrupted_write(tmp_path, monkeypatch):
+    source = tmp_path / 'notes.csv'
+    pd.DataFrame({
+        'id': range(6),
+        'note': ['plain', 'multi\nline', 'quoted "word"', '', 'comma, inside', 'last\r\nline'],
+    }).to_csv(source, index=False)
+    full = tmp_path / 'full.csv'
+    run_cli(monkeypatch, source, full, '--chunksize', 2)
+    expected = full.read_bytes()
+
+    output = tmp_path / 'resumed.csv'
+    for cut in range(len(expected)):
+        output.write_bytes(expected[:cut])
+        run_cli(monkeypatch, source, output, '--chunksize', 2, '--resume')
+        assert output.read_bytes() == expected, cut
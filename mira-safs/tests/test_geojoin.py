@@ -0,0 +1,33 @@
+import os
+
+import pandas as pd
+import pytest
+
+import geojoin
+import geojson_stream
+
+ASSETS = os.path.join(os.path.dirname(__file__), '..', 'assets')
+
+def test_streamed_vertices_match_geopandas():
+    gpd = pytest.importorskip('geopandas')
+    path = os.path.join(ASSETS, 'field.geojson')
+    expected = geojoin.vertices_from_fields(gpd.read_file(path))
+    streamed = geojoin.vertices_from_features(geojson_stream.iter_features(path))
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+def test_vertices_skip_non_polygons_and_name_by_position():
+    ring = [[-1.5, 52.0, 10.0], [-1.49, 52.0, 10.0], [-1.49, 52.01, 10.0], [-1.5, 52.0, 10.0]]
+    features = [
+        {'type': 'Feature', 'properties': {'name': 'north'}, 'geometry': {'type': 'Point', 'coordinates': [0, 0]}},
+        {'type': 'Feature', 'properties': None, 'geometry': {'type': 'MultiPolygon', 'coordinates': [[ring], []]}},
+        {'type': 'Feature', 'properties': {'name': 7}, 'geometry': None},
+    ]
+    vertices = geojoin.vertices_from_features(features)
+    assert vertices['Name'].unique().tolist() == ['1']
+    assert vertices[['Longitude', 'Latitude']].values.tolist() == [point[:2] for point in ring]
+
+def test_index_from_geojson_assigns_points_inside_fields():
+    index = geojoin.FieldIndex.from_geojson(os.path.join(ASSETS, 'field.geojson'))
+    names, distances = index.nearest(index.centroids['Latitude'], index.centroids['Longitude'])
+    assert names.tolist() == index.centroids['Name'].tolist()
+    assert (distances == 0).all()
@@ -0,0 +1,150 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import geojson_stream
+
+ASSETS = os.path.join(os.path.dirname(__file__), '..', 'assets')
+
+SHELL = [[-1.50, 52.00], [-1.49, 52.00], [-1.49, 52.01], [-1.50, 52.01], [-1.50, 52.00]]
+HOLE = [[-1.497, 52.003], [-1.493, 52.003], [-1.493, 52.007], [-1.497, 52.007], [-1.497, 52.003]]
+SECOND = [[-1.48, 52.02], [-1.47, 52.02], [-1.475, 52.03], [-1.48, 52.02]]
+
+FEATURES = [
+    {'type': 'Feature', 'properties': {'name': 'field1', 'note': 'café "north" \\ 1e-3'},
+     'geometry': {'type': 'Polygon', 'coordinates': [SHELL, HOLE]}},
+    {'type': 'Feature', 'properties': {'name': 'field2_3', 'values': [1.25e-7, -0.0, 123456789.125, None, True]},
+     'geometry': {'type': 'MultiPolygon', 'coordinates': [[SHELL, HOLE], [SECOND]]}},
+    {'type': 'Feature', 'properties': {}, 'geometry': {'type': 'Point', 'coordinates': [-1.5, 52.0]}},
+    {'type': 'Feature', 'properties': {'name': 'empty'}, 'geometry': None},
+]
+
+def write_collection(path, features, crs=None, indent=None):
+    # A top-level number (as in WFS output) may be split across read blocks
+    collection = {'type': 'FeatureCollection', 'totalFeatures': 1234567}
+    if crs is not None:
+        collection['crs'] = {'type': 'name', 'properties': {'name': crs}}
+    collection['features'] = features
+    path.write_text(json.dumps(collection, indent=indent), encoding='utf-8')
+    return path
+
+@pytest.mark.parametrize('block_size', [1, 2, 3, 7, 16, 64, 1 << 20])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_iter_features_across_block_boundaries(tmp_path, block_size, indent):
+    path = write_collection(tmp_path / 'fields.geojson', FEATURES, indent=indent)
+    assert list(geojson_stream.iter_features(path, block_size)) == FEATURES
+
+@pytest.mark.parametrize('block_size', [5, 4096])
+def test_iter_features_matches_json_load_on_assets(block_size):
+    path = os.path.join(ASSETS, 'field.geojson')
+    with open(path, encoding='utf-8') as f:
+        expected = json.load(f)['features']
+    assert list(geojson_stream.iter_features(path, block_size)) == expected
+
+def test_iter_batches_sizes(tmp_path):
+    path = write_collection(tmp_path / 'fields.geojson', FEATURES)
+    assert [len(batch) for batch in geojson_stream.iter_batches(path, batch_size=3, block_size=8)] == [3, 1]
+
+def test_wgs84_crs_is_accepted(tmp_path):
+    path = write_collection(tmp_path / 'fields.geojson', FEATURES, crs='urn:ogc:def:crs:OGC:1.3:CRS84')
+    assert len(list(geojson_stream.iter_features(path, 4))) == len(FEATURES)
+
+def test_non_wgs84_crs_is_rejected(tmp_path):
+    path = write_collection(tmp_path / 'fields.geojson', FEATURES, crs='urn:ogc:def:crs:EPSG::27700')
+    with pytest.raises(ValueError, match='EPSG::27700'):
+        list(geojson_stream.iter_features(path, 4))
+
+def test_truncated_file_raises(tmp_path):
+    path = write_collection(tmp_path / 'fields.geojson', FEATURES)
+    path.write_text(path.read_text()[:-40], encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(geojson_stream.iter_features(path, 16))
+
+def test_areas_match_geopandas_web_mercator():
+    gpd = pytest.importorskip('geopandas')
+    from shapely.geometry import shape
+
+    polygons = FEATURES[:2]
+    expected = gpd.GeoSeries([shape(f['geometry']) for f in polygons], crs='EPSG:4326').to_crs(3857).area / 10000
+    areas = geojson_stream.areas_ha(polygons)
+    np.testing.assert_allclose(areas, expected.to_numpy(), rtol=1e-9)
+    # The hole is subtracted from its shell and the second polygon is added
+    assert areas[0] < areas[1]
+
+def test_areas_of_non_polygons_are_zero():
+    np.testing.assert_array_equal(geojson_stream.areas_ha(FEATURES[2:]), [0.0, 0.0])
+
+@pytest.mark.parametrize('geometry', [
+    FEATURES[0]['geometry'],
+    FEATURES[1]['geometry'],
+    FEATURES[2]['geometry'],
+    {'type': 'LineString', 'coordinates': SECOND},
+    {'type': 'MultiLineString', 'coordinates': [SHELL, SECOND]},
+    {'type': 'MultiPoint', 'coordinates': SECOND},
+    {'type': 'GeometryCollection', 'geometries': [FEATURES[2]['geometry'], FEATURES[0]['geometry']]},
+])
+def test_wkb_round_trip(geometry):
+    shapely = pytest.importorskip('shapely')
+    from shapely.geometry import shape
+
+    assert shapely.from_wkb(geojson_stream.to_wkb(geometry)).equals_exact(shape(geometry), 0)
+
+def test_wkb_drops_third_dimension():
+    shapely = pytest.importorskip('shapely')
+
+    geometry = {'type': 'Polygon', 'coordinates': [[point + [100.0] for point in SHELL]]}
+    decoded = shapely.from_wkb(geojson_stream.to_wkb(geometry))
+    assert not decoded.has_z
+    assert list(decoded.exterior.coords) == [tuple(point) for point in SHELL]
+
+def test_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(geojson_stream, 'CACHE_DIR', tmp_path / 'cache')
+    path = write_collection(tmp_path / 'fields.geojson', FEATURES)
+    frames = list(geojson_stream.iter_cache(path, batch_size=3))
+    assert [len(frame) for frame in frames] == [3, 1]
+    table = geojson_stream.area_table(path)
+    # Features without a name are named by their position
+    assert table['name'].tolist() == ['field1', 'field2_3', '2', 'empty']
+    np.testing.assert_allclose(table['area_ha'], geojson_stream.areas_ha(FEATURES))
+    assert frames[0]['geometry'][0] == geojson_stream.to_wkb(FEATURES[0]['geometry'])
+
+def test_superseded_caches_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(geojson_stream, 'CACHE_DIR', tmp_path / 'cache')
+    path = tmp_path / 'fields.geojson'
+    other = write_collection(tmp_path / 'fields-other.geojson', FEATURES)
+    geojson_stream.build_cache(other)
+    for version in range(5):
+        write_collection(path, FEATURES[:version + 1])
+        os.utime(path, ns=(version * 10 ** 9, version * 10 ** 9))
+        current = geojson_stream.build_cache(path)
+
+    remaining = sorted(cache.name for cache in (tmp_path / 'cache').iterdir())
+    caches = [name for name in remaining if name.startswith('fields-') and not name.startswith('fields-other-')]
+    assert len(caches) == geojson_stream.datastore.KEEP_VERSIONS
+    assert current.name in caches
+    # Caches of other sources sharing a name prefix are left alone
+    assert geojson_stream.cache_path(other).name in remaining
+    assert not [name for name in remaining if name.startswith('.')]
+
+@pytest.mark.parametrize('block_size', [1, 2, 3, 5])
+def test_escapes_and_brackets_inside_strings(tmp_path, block_size):
+    features = [{'type': 'Feature', 'geometry': None,
+                 'properties': {'name': 'a\\\\"}]', 'note': '\\"[{\\\\', 'tail': '\\\\\\\\'}}]
+    path = write_collection(tmp_path / 'fields.geojson', features)
+    assert list(geojson_stream.iter_features(path, block_size)) == features
+
+def test_large_feature_is_scanned_once(tmp_path, monkeypatch):
+    ring = [[-1.5 + i * 1e-6, 52.0 + (i % 7) * 1e-6] for i in range(20000)]
+    features = [{'type': 'Feature', 'properties': {'name': 'big'},
+                 'geometry': {'type': 'Polygon', 'coordinates': [ring + ring[:1]]}}]
+    path = write_collection(tmp_path / 'fields.geojson', features)
+    scanned = []
+    scan = geojson_stream._Reader._scan
+    monkeypatch.setattr(geojson_stream._Reader, '_scan',
+                        lambda self, data, state: scanned.append(len(data)) or scan(self, data, state))
+    assert list(geojson_stream.iter_features(path, block_size=4096)) == features
+    # Bytes of the feature are scanned once, however many blocks it spans;
+    # only the buffered tail after each complete value is scanned again
+    assert sum(scanned) < 2 * os.path.getsize(path)
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+import images
+
+PIL = pytest.importorskip('PIL.Image')
+
+def test_superseded_derivatives_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(images, 'CACHE_DIR', tmp_path / 'cache')
+    source = tmp_path / 'field.png'
+    other = tmp_path / 'field-other.png'
+    PIL.new('RGB', (800, 400), 'green').save(other)
+    images.build_derivative(other, 320)
+    for version in range(5):
+        PIL.new('RGB', (800 + version, 400), 'green').save(source)
+        os.utime(source, ns=(version * 10 ** 9, version * 10 ** 9))
+        current = [images.build_derivative(source, width) for width in (320, 640)]
+
+    remaining = sorted(path.name for path in (tmp_path / 'cache').iterdir())
+    for width, path in zip((320, 640), current):
+        kept = [name for name in remaining if name.startswith(f'field-{width}w-')]
+        assert len(kept) == images.datastore.KEEP_VERSIONS
+        assert path.name in kept
+    # Derivatives of other sources sharing a name prefix are left alone
+    assert images.derivative_path(other, 320).name in remaining
+    assert not [name for name in remaining if name.startswith('.')]
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+import training
+from training import IncrementalLinearRegression
+
+def random_batches(seed, sizes=(30, 1, 45, 24)):
+    rng = np.random.default_rng(seed)
+    batches = []
+    for size in sizes:
+        X = rng.normal(size=(size, len(training.SOIL_FEATURES)))
+        batches.append((X, X @ np.arange(1, 7) + 5 + rng.normal(size=size), rng.normal(size=size)))
+    return batches
+
+def test_batches_match_least_squares_on_all_rows():
+    batches = random_batches(0)
+    productivity, _ = training.fit_batches(batches)
+    X = np.concatenate([X for X, _, _ in batches])
+    y = np.concatenate([y for _, y, _ in batches])
+    expected = np.linalg.lstsq(np.column_stack([np.ones(len(X)), X]), y, rcond=None)[0]
+    np.testing.assert_allclose(productivity.intercept_, expected[0])
+    np.testing.assert_allclose(productivity.coef_, expected[1:])
+
+def test_rejected_batch_updates_neither_model():
+    productivity, fertilizer = training.fit_batches(random_batches(1))
+    X, y_productivity, y_fertilizer = random_batches(2)[0]
+    y_fertilizer[3] = np.nan
+    before = productivity.coef_.copy(), fertilizer.coef_.copy()
+    with pytest.raises(ValueError):
+        training.fit_batches([(X, y_productivity, y_fertilizer)], productivity, fertilizer)
+    assert productivity.n_samples_ == fertilizer.n_samples_ == 100
+    np.testing.assert_array_equal(productivity.coef_, before[0])
+    np.testing.assert_array_equal(fertilizer.coef_, before[1])
+
+def test_save_and_load_resume_training(tmp_path):
+    first, second = random_batches(3, sizes=(40,)), random_batches(4, sizes=(40,))
+    model, _ = training.fit_batches(first)
+    model.save(tmp_path / 'model.npz')
+    resumed = IncrementalLinearRegression.load(tmp_path / 'model.npz')
+    resumed, _ = training.fit_batches(second, resumed)
+    full, _ = training.fit_batches(first + second)
+    np.testing.assert_allclose(resumed.coef_, full.coef_)
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import schemas
+
+# Soil columns used as model features
+SOIL_FEATURES = ['soil_nitrogen', 'soil_phosphorus', 'soil_potassium',
+                 'soil_moisture', 'soil_ph', 'organic_matter']
+
+DEFAULT_CHUNKSIZE = 100_000
+
+class IncrementalLinearRegression:
+    """Ordinary least squares fitted from running sufficient statistics.
+
+    Each call to partial_fit only adds the batch's X'X and X'y to the running
+    totals, so the model can be updated with new batches without revisiting
+    earlier data. The coefficients are solved on demand and are identical to
+    fitting LinearRegression on the concatenation of all batches.
+    """
+
+    def __init__(self, n_features=len(SOIL_FEATURES)):
+        self.n_features = n_features
+        self.n_samples_ = 0
+        # Augmented with a leading intercept column
+        self._xtx = np.zeros((n_features + 1, n_features + 1))
+        self._xty = np.zeros(n_features + 1)
+        self._beta = None
+
+    def partial_fit(self, X, y):
+        """Add a batch of samples to the running totals.
+
+        Raises ValueError, leaving the model unchanged, if the batch has the
+        wrong shape or contains NaN or infinite values.
+        """
+        return self._add(*self._check_batch(X, y))
+
+    def _check_batch(self, X, y):
+        """Return the batch as float arrays, raising ValueError if it cannot be added."""
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(X) == 0:
+            return X, y
+        if X.ndim != 2 or X.shape[1] != self.n_features or y.shape != (len(X),):
+            raise ValueError(f"Expected X of shape (n, {self.n_features}) and y of shape (n,), "
+                             f"got {X.shape} and {y.shape}.")
+        if not (np.isfinite(X).all() and np.isfinite(y).all()):
+            raise ValueError("Training batch contains NaN or infinite values.")
+        return X, y
+
+    def _add(self, X, y):
+        if len(X) == 0:
+            return self
+        Xa = np.column_stack([np.ones(len(X)), X])
+        self._xtx += Xa.T @ Xa
+        self._xty += Xa.T @ y
+        self.n_samples_ += len(X)
+        self._beta = None
+        return self
+
+    def _solution(self):
+        if self._beta is None:
+            # lstsq tolerates a singular X'X (e.g. a constant column in early batches)
+            self._beta = (np.linalg.lstsq(self._xtx, self._xty, rcond=None)[0] if self.n_samples_
+                          else np.zeros(self.n_features + 1))
+        return self._beta
+
+    @property
+    def coef_(self):
+        return self._solution()[1:]
+
+    @property
+    def intercept_(self):
+        return self._solution()[0]
+
+    def predict(self, X):
+        """Predict targets for the given feature rows."""
+        return np.asarray(X, dtype=float) @ self.coef_ + self.intercept_
+
+    def save(self, path):
+        """Persist the sufficient statistics so training can resume later."""
+        np.savez(path, xtx=self._xtx, xty=self._xty, n_samples=self.n_samples_)
+
+    @classmethod
+    def load(cls, path):
+        """Restore a model saved with save()."""
+        with np.load(path) as state:
+            model = cls(n_features=state['xtx'].shape[0] - 1)
+            model._xtx = state['xtx']
+            model._xty = state['xty']
+            model.n_samples_ = int(state['n_samples'])
+        return model
+
+def _read_validated(assets_path, filename, usecols):
+    """Read and validate the given columns of an asset file."""
+    return schemas.validate(pd.read_csv(assets_path / filename, usecols=usecols), filename, columns=usecols)
+
+def iter_training_batches(assets_path=None, chunksize=DEFAULT_CHUNKSIZE, id_column='id'):
+    """Stream the soil/production/fertilizer merge in chunks.
+
+    Only the id and target columns of the crops and fertilizer files are held
+    in memory as lookup series; the soil file, which carries the feature
+    matrix, is read chunk by chunk. Yields (X, y_productivity, y_fertilizer).
+    """
+    if assets_path is None:
+        assets_path = Path(__file__).parent / 'assets'
+    production = _read_validated(assets_path, 'crops_data.csv', [id_column, 'production'])
+    production = production.drop_duplicates(id_column).set_index(id_column)['production']
+    quantity = _read_validated(assets_path, 'fertilizers_data.csv', [id_column, 'quantity'])
+    quantity = quantity.drop_duplicates(id_column).set_index(id_column)['quantity']
+
+    usecols = [id_column] + SOIL_FEATURES
+    for chunk in pd.read_csv(assets_path / 'soil_data.csv', usecols=usecols, chunksize=chunksize):
+        # Rows the page would reject at load are skipped here too
+        chunk = schemas.validate(chunk, 'soil_data.csv', columns=usecols)
+        chunk = chunk.assign(production=chunk[id_column].map(production),
+                             quantity=chunk[id_column].map(quantity))
+        # Inner-join semantics of the original pd.merge
+        chunk = chunk.dropna(subset=['production', 'quantity'])
+        yield chunk[SOIL_FEATURES].values, chunk['production'].values, chunk['quantity'].values
+
+def fit_batches(batches, productivity_model=None, fertilizer_model=None):
+    """Update (or create) both models from an iterable of training batches.
+
+    Each batch is validated for both targets before either model is updated,
+    so a rejected batch never leaves the two models trained on different rows.
+    """
+    if productivity_model is None:
+        productivity_model = IncrementalLinearRegression()
+    if fertilizer_model is None:
+        fertilizer_model = IncrementalLinearRegression()
+    for X, y_productivity, y_fertilizer in batches:
+        X, y_productivity = productivity_model._check_batch(X, y_productivity)
+        X, y_fertilizer = fertilizer_model._check_batch(X, y_fertilizer)
+        productivity_model._add(X, y_productivity)
+        fertilizer_model._add(X, y_fertilizer)
+    return productivity_model, fertilizer_model
+
+def train_models(assets_path=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Train the productivity and fertilizer models out of core.
+
+    The dashboard retrains from scratch whenever a source file changes; the
+    asset files carry no marker of which rows are new, so resuming saved
+    models with only appended rows is left to callers of fit_batches.
+    """
+    return fit_batches(iter_training_batches(assets_path, chunksize))
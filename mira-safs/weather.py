@@ -1,28 +1,37 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from pathlib import Path
-import os
+import early_warning
+import export
+import datastore
+import schemas
+import geojoin
 
 def load_data():
     """Load the CSV file from the 'assets' directory."""
     try:
-        # Determine the path to the 'assets' directory
-        # __file__ might not be set in all environments; adjust as needed.
-        base_path = Path(os.path.dirname(os.path.abspath(__file__)))
-        assets_path = base_path / 'assets'
-        csv_path = assets_path / 'climate_data.csv'
+        # Determine the path to the 'assets' directory (overridable with MIRA_ASSETS_DIR)
+        csv_path = datastore.ASSETS_PATH / 'climate_data.csv'
         
         # Check if the file exists
         if not csv_path.is_file():
             raise FileNotFoundError(f"CSV file not found at {csv_path}")
         
-        # Load the CSV file
-        return pd.read_csv(csv_path)
+        # Load the CSV file through the shared store
+        return datastore.load_csv(csv_path.name)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return pd.DataFrame()  # Return an empty DataFrame in case of error
 
+@st.cache_resource
+def get_warning_evaluator(path):
+    """Return the process-wide evaluator for a climate data file.
+
+    Only readings appended since the last rerun are evaluated; the evaluator
+    resets itself if the file is replaced.
+    """
+    return early_warning.EarlyWarningEvaluator()
+
 def app():
     # Load data
     data = load_data()
@@ -31,6 +40,9 @@ def app():
     if data.empty:
         st.error("No data available to display.")
         return
+    message = schemas.issues_message(data)
+    if message:
+        st.warning(message)
 
     # Create the Streamlit layout
     st.title("Climate Data Analysis")
@@ -74,21 +86,53 @@ def app():
         st.write("""
         This graph shows the distribution of drought and flooding risks as percentages.
         """)
-        # Create a DataFrame for risk distribution
-        draught_counts = data[['draught_risk']].copy()
-        draught_counts['Risk Type'] = 'Drought Risk'
-
-        flooding_counts = data[['flooding_risk']].copy()
-        flooding_counts['Risk Type'] = 'Flooding Risk'
+        # Reshape both risk series into one column so each is binned on its own values
+        combined_risks = data[['draught_risk', 'flooding_risk']].rename(
+            columns={'draught_risk': 'Drought Risk', 'flooding_risk': 'Flooding Risk'}
+        ).melt(var_name='Risk Type', value_name='Risk Percentage')
 
-        # Combine risk data for display
-        combined_risks = pd.concat([draught_counts, flooding_counts], ignore_index=True)
-        
-        fig4 = px.histogram(combined_risks, x='draught_risk', color='Risk Type', nbins=20,
+        fig4 = px.histogram(combined_risks, x='Risk Percentage', color='Risk Type', nbins=20,
                             title="Distribution of Drought and Flooding Risks",
-                            labels={'draught_risk': 'Risk Percentage'})
+                            barmode='overlay')
         st.plotly_chart(fig4)
 
+    st.header("Early Warnings")
+    st.write("""
+    Warnings are raised per crop when all of a rule's conditions hold for the required number of consecutive readings.
+    """)
+    evaluator = get_warning_evaluator(str(datastore.ASSETS_PATH / 'climate_data.csv'))
+    evaluator.evaluate(data)
+    st.table(early_warning.rules_table())
+    if evaluator.events.empty:
+        st.info("No warnings raised.")
+    else:
+        st.dataframe(evaluator.events, hide_index=True, width='stretch')
+
+    exports = {
+        'Climate Readings': data,
+        'Risk Distribution': combined_risks,
+        'Early Warnings': evaluator.events
+    }
+
+    # Break readings down per field when sensors report their coordinates
+    coordinates = geojoin.coordinate_columns(data)
+    if coordinates:
+        st.header("Climate by Field")
+        st.write("""
+        This graph shows average drought and flooding risk for readings assigned to their nearest field.
+        """)
+        located = geojoin.get_field_index().assign_frame(data, *coordinates)
+        climate_by_field = (located.dropna(subset=['field'])
+                            .groupby('field')[['draught_risk', 'flooding_risk', 'rain', 'soil_moisture']]
+                            .mean().reset_index())
+        exports['Climate by Field'] = climate_by_field
+        fig5 = px.bar(climate_by_field, x='field', y=['draught_risk', 'flooding_risk'], barmode='group',
+                      title="Average Drought and Flooding Risk by Field",
+                      labels={'field': 'Field', 'value': 'Risk Percentage', 'variable': 'Risk Type'})
+        st.plotly_chart(fig5)
+
+    export.export_section(exports, key='weather')
+
 if __name__ == "__main__":
     app()
 